@@ -2,6 +2,7 @@
 
 import time
 from datetime import datetime, timedelta
+from typing import Optional
 
 import streamlit as st
 import pandas as pd
@@ -51,19 +52,30 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def get_status_indicator(connected: bool, updated_at: int) -> tuple[str, bool]:
-    """Return (label, is_live) for the header badge."""
+def get_status_indicator(
+    connected: bool, updated_at: int, now_ms: Optional[int] = None
+) -> tuple[str, bool]:
+    """Return (label, is_live) for the header badge.
+
+    Args:
+        connected: Whether Redis is reachable
+        updated_at: Last update time (epoch milliseconds)
+        now_ms: Current time (epoch milliseconds); pass one value per render
+            pass so every badge shares a single clock read
+    """
     if not connected:
         return "Disconnected", False
     if updated_at == 0:
         return "Waiting for data...", False
-    age_seconds = (time.time() * 1000 - updated_at) / 1000
-    if age_seconds < 10:
+    if now_ms is None:
+        now_ms = time.time_ns() // 1_000_000
+    age_ms = now_ms - updated_at
+    if age_ms < 10_000:
         return "Live", True
-    elif age_seconds < 60:
-        return f"{int(age_seconds)}s ago", False
+    elif age_ms < 60_000:
+        return f"{age_ms // 1000}s ago", False
     else:
-        return f"{int(age_seconds / 60)}m ago", False
+        return f"{age_ms // 60_000}m ago", False
 
 
 def setup_sidebar(portfolio_service):
@@ -141,6 +153,7 @@ def main():
     while True:  # ← Never exits, no page reload!
         try:
             refresh_count += 1
+            now_ms = time.time_ns() // 1_000_000
             
             # ── Fetch fresh data ──
             fetcher = RiskDataFetcher(
@@ -197,7 +210,8 @@ def main():
                 containers.header,
                 connected,
                 aggregates.updated_at,
-                selected_portfolio
+                selected_portfolio,
+                now_ms=now_ms,
             )
             
             update_alerts(
@@ -36,7 +36,7 @@ def render_live_badge(label: str, is_live: bool):
     st.markdown(html, unsafe_allow_html=True)
 
 
-def update_header(container, connected, updated_at, selected_portfolio):
+def update_header(container, connected, updated_at, selected_portfolio, now_ms=None):
     """Update header section without reload."""
     with container.container():
         col1, col2 = st.columns([3, 1])
@@ -47,7 +47,7 @@ def update_header(container, connected, updated_at, selected_portfolio):
             st.title(title)
         with col2:
             from main import get_status_indicator
-            label, is_live = get_status_indicator(connected, updated_at)
+            label, is_live = get_status_indicator(connected, updated_at, now_ms)
             render_live_badge(label, is_live)
 
 
@@ -3,19 +3,85 @@
 import pytest
 import pandas as pd
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, patch
 import sys
 import os
 
+import httpx
+
 # Add app directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
 
-# Mock streamlit before importing modules that use it
+
+_MISSING = object()
+
+
+class MockSessionState(dict):
+    """Mock that behaves like Streamlit's session_state (dict with attribute access)."""
+    def __getattr__(self, key):
+        value = dict.get(self, key, _MISSING)
+        if value is _MISSING:
+            raise AttributeError(key)
+        return value
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+    def __delattr__(self, key):
+        if dict.pop(self, key, _MISSING) is _MISSING:
+            raise AttributeError(key)
+
+
+# Mock streamlit once per session, before importing modules that use it
 mock_st = MagicMock()
-mock_st.session_state = {}
+mock_st.session_state = MockSessionState()
 mock_st.cache_data = lambda ttl=None: lambda func: func
+mock_st.columns = MagicMock(return_value=[MagicMock(), MagicMock()])
+mock_st.selectbox = MagicMock(return_value="DV01")
 sys.modules['streamlit'] = mock_st
 
+# Real httpx client class captured before tests @patch it; used as mock spec
+_HttpxClient = httpx.Client
+
+
+@pytest.fixture
+def streamlit_mock():
+    """Shared streamlit mock installed in sys.modules."""
+    return mock_st
+
+
+# apply_filters results keyed by (id(df), filter config); the frame is kept
+# alongside the result so a recycled id() can never produce a stale hit.
+_FILTER_RESULTS = {}
+
+
+def _filter_key(filters):
+    """Hashable, order-independent key for a filter config."""
+    return tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v) for k, v in filters.items()
+    ))
+
+
+@pytest.fixture
+def memoized_filters():
+    """PortfolioFilters whose apply_filters memoizes repeat (df, config) calls.
+
+    Test-only: results are shared, so don't use it where a test mutates the
+    input or output frame.
+    """
+    from components.filters import PortfolioFilters
+
+    class MemoizedFilters(PortfolioFilters):
+        def apply_filters(self, df, filters):
+            key = (id(df), _filter_key(filters))
+            hit = _FILTER_RESULTS.get(key)
+            if hit is None or hit[0] is not df:
+                hit = (df, super().apply_filters(df, filters))
+                _FILTER_RESULTS[key] = hit
+            return hit[1]
+
+    return MemoizedFilters()
+
 
 @pytest.fixture
 def sample_trades_df():
@@ -119,7 +185,18 @@ def mock_redis_client():
 
 
 @pytest.fixture
-def mock_httpx_client():
-    """Create mock httpx client."""
-    client = MagicMock()
-    return client
+def httpx_client_mock():
+    """Factory for a context-manager-ready httpx client mock.
+
+    A single response is returned from every ``get``; a list is consumed in order.
+    """
+    def _make(responses):
+        client = Mock(spec=_HttpxClient)
+        client.__enter__ = MagicMock(return_value=client)
+        client.__exit__ = MagicMock(return_value=False)
+        if isinstance(responses, list):
+            client.get.side_effect = responses
+        else:
+            client.get.return_value = responses
+        return client
+    return _make
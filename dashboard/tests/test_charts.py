@@ -3,62 +3,29 @@
 import pytest
 from unittest.mock import MagicMock, patch
 import pandas as pd
-import sys
-import os
 
-# Setup path and mocks
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
-
-
-class MockSessionState(dict):
-    """Mock that behaves like Streamlit's session_state."""
-    def __getattr__(self, key):
-        try:
-            return self[key]
-        except KeyError:
-            raise AttributeError(key)
-
-    def __setattr__(self, key, value):
-        self[key] = value
-
-    def __delattr__(self, key):
-        try:
-            del self[key]
-        except KeyError:
-            raise AttributeError(key)
-
-    def get(self, key, default=None):
-        return super().get(key, default)
-
-
-# Mock streamlit
-mock_st = MagicMock()
-mock_st.session_state = MockSessionState({"theme": "light"})
-sys.modules['streamlit'] = mock_st
-
-# Now import the charts module
 from components.charts import AdvancedCharts
 
 
 class TestAdvancedChartsTheme:
     """Tests for theme handling."""
 
-    def test_get_template_dark(self):
+    def test_get_template_dark(self, streamlit_mock):
         """Test dark theme returns plotly_dark template."""
-        mock_st.session_state["theme"] = "dark"
+        streamlit_mock.session_state["theme"] = "dark"
         template = AdvancedCharts.get_template()
         assert template == "plotly_dark"
 
-    def test_get_template_light(self):
+    def test_get_template_light(self, streamlit_mock):
         """Test light theme returns plotly_white template."""
-        mock_st.session_state["theme"] = "light"
+        streamlit_mock.session_state["theme"] = "light"
         template = AdvancedCharts.get_template()
         assert template == "plotly_white"
 
-    def test_get_template_default(self):
+    def test_get_template_default(self, streamlit_mock):
         """Test default theme returns plotly_white when theme is missing."""
         # Clear the session state (remove theme key)
-        mock_st.session_state.clear()
+        streamlit_mock.session_state.clear()
         template = AdvancedCharts.get_template()
         # Should default to "dark" which maps to plotly_dark because of the default arg
         # Let's verify the actual behavior rather than assumed behavior
@@ -68,9 +35,11 @@ class TestAdvancedChartsTheme:
 class TestHistoricalDV01Chart:
     """Tests for historical DV01 chart."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_theme(self, streamlit_mock):
         """Reset theme before each test."""
-        mock_st.session_state = MockSessionState({"theme": "light"})
+        streamlit_mock.session_state.clear()
+        streamlit_mock.session_state["theme"] = "light"
 
     def test_empty_dataframe(self):
         """Test chart with empty DataFrame shows placeholder."""
@@ -126,9 +95,11 @@ class TestHistoricalDV01Chart:
 class TestConcentrationChart:
     """Tests for concentration chart."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_theme(self, streamlit_mock):
         """Reset theme before each test."""
-        mock_st.session_state = MockSessionState({"theme": "light"})
+        streamlit_mock.session_state.clear()
+        streamlit_mock.session_state["theme"] = "light"
 
     def test_empty_dataframe(self):
         """Test chart with empty DataFrame."""
@@ -176,9 +147,11 @@ class TestConcentrationChart:
 class TestConcentrationPie:
     """Tests for concentration pie chart."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_theme(self, streamlit_mock):
         """Reset theme before each test."""
-        mock_st.session_state = MockSessionState({"theme": "light"})
+        streamlit_mock.session_state.clear()
+        streamlit_mock.session_state["theme"] = "light"
 
     def test_empty_dataframe(self):
         """Test pie with empty DataFrame."""
@@ -217,9 +190,11 @@ class TestConcentrationPie:
 class TestKRDHeatmap:
     """Tests for KRD heatmap."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_theme(self, streamlit_mock):
         """Reset theme before each test."""
-        mock_st.session_state = MockSessionState({"theme": "light"})
+        streamlit_mock.session_state.clear()
+        streamlit_mock.session_state["theme"] = "light"
 
     def test_empty_dataframe(self):
         """Test heatmap with empty DataFrame."""
@@ -275,9 +250,11 @@ class TestKRDHeatmap:
 class TestPortfolioBreakdownChart:
     """Tests for portfolio breakdown chart."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_theme(self, streamlit_mock):
         """Reset theme before each test."""
-        mock_st.session_state = MockSessionState({"theme": "light"})
+        streamlit_mock.session_state.clear()
+        streamlit_mock.session_state["theme"] = "light"
 
     def test_empty_dataframe(self):
         """Test chart with empty DataFrame."""
@@ -389,9 +366,11 @@ class TestPortfolioBreakdownChart:
 class TestPortfolioPieChart:
     """Tests for portfolio pie chart."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_theme(self, streamlit_mock):
         """Reset theme before each test."""
-        mock_st.session_state = MockSessionState({"theme": "light"})
+        streamlit_mock.session_state.clear()
+        streamlit_mock.session_state["theme"] = "light"
 
     def test_empty_dataframe(self):
         """Test pie with empty DataFrame."""
@@ -437,9 +416,11 @@ class TestPortfolioPieChart:
 class TestDualAxisChart:
     """Tests for dual axis chart."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_theme(self, streamlit_mock):
         """Reset theme before each test."""
-        mock_st.session_state = MockSessionState({"theme": "light"})
+        streamlit_mock.session_state.clear()
+        streamlit_mock.session_state["theme"] = "light"
 
     def test_empty_dataframes(self):
         """Test chart with empty DataFrames."""
@@ -508,9 +489,11 @@ class TestDualAxisChart:
 class TestPortfolioComparisonChart:
     """Tests for portfolio comparison chart."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_theme(self, streamlit_mock):
         """Reset theme before each test."""
-        mock_st.session_state = MockSessionState({"theme": "light"})
+        streamlit_mock.session_state.clear()
+        streamlit_mock.session_state["theme"] = "light"
 
     def test_empty_inputs(self):
         """Test chart with empty inputs."""
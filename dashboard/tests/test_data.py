@@ -1,20 +1,50 @@
 """Tests for data fetching module."""
 
 import pytest
-from unittest.mock import MagicMock, patch, PropertyMock
+from unittest.mock import MagicMock, Mock, patch, PropertyMock
 from datetime import datetime, timedelta
+import httpx
 import pandas as pd
-import sys
-import os
-
-# Setup path and mocks
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
-
-# Mock streamlit
-mock_st = MagicMock()
-mock_st.session_state = {}
-mock_st.cache_data = lambda ttl=None: lambda func: func
-sys.modules['streamlit'] = mock_st
+import redis
+
+# Real client classes captured before @patch swaps them out; used as mock specs
+_HttpxResponse = httpx.Response
+_RedisClient = redis.Redis
+_RedisPipeline = redis.client.Pipeline
+
+# Redis hash payloads shared by the fetcher tests (read-only)
+_AGG_HASH = {
+    "total_npv": "100000000",
+    "total_dv01": "500000",
+    "instrument_count": "100",
+    "total_krd_2y": "100000",
+    "total_krd_5y": "150000",
+    "total_krd_10y": "175000",
+    "total_krd_30y": "75000",
+    "updated_at": "1704067200000",
+}
+
+_TRADE_HASH_1 = {
+    "npv": "1000000",
+    "dv01": "12500",
+    "krd_2y": "2500",
+    "krd_5y": "4000",
+    "krd_10y": "4000",
+    "krd_30y": "2000",
+    "curve_timestamp": "1704067200000",
+    "updated_at": "1704067200000",
+}
+
+_TRADE_HASH_2 = {
+    "npv": "500000",
+    "dv01": "-8500",
+    "krd_2y": "-1500",
+    "krd_5y": "-2500",
+    "krd_10y": "-3000",
+    "krd_30y": "-1500",
+    "curve_timestamp": "1704067200000",
+    "updated_at": "1704067200000",
+}
 
 
 class TestTradeRisk:
@@ -121,22 +151,18 @@ class TestPortfolioService:
         assert service.api_url == "http://localhost:8000"
 
     @patch('httpx.Client')
-    def test_get_portfolios_success(self, mock_client_class):
+    def test_get_portfolios_success(self, mock_client_class, httpx_client_mock):
         """Test successful portfolio fetching."""
         from data import PortfolioService
 
-        mock_response = MagicMock()
+        mock_response = Mock(spec=_HttpxResponse)
         mock_response.status_code = 200
         mock_response.json.return_value = [
             {"id": "CREDIT_IG", "name": "Credit IG", "description": "",
              "strategy_type": "credit", "bond_count": 50, "total_notional": 50000000},
         ]
 
-        mock_client = MagicMock()
-        mock_client.get.return_value = mock_response
-        mock_client.__enter__ = MagicMock(return_value=mock_client)
-        mock_client.__exit__ = MagicMock(return_value=False)
-        mock_client_class.return_value = mock_client
+        mock_client_class.return_value = httpx_client_mock(mock_response)
 
         service = PortfolioService("http://localhost:8000")
         portfolios = service.get_portfolios()
@@ -145,19 +171,15 @@ class TestPortfolioService:
         assert portfolios[0].id == "CREDIT_IG"
 
     @patch('httpx.Client')
-    def test_get_portfolios_api_error_fallback(self, mock_client_class):
+    def test_get_portfolios_api_error_fallback(self, mock_client_class, httpx_client_mock):
         """Test fallback to instruments when portfolio API fails."""
         from data import PortfolioService
 
-        mock_client = MagicMock()
-        mock_client.__enter__ = MagicMock(return_value=mock_client)
-        mock_client.__exit__ = MagicMock(return_value=False)
-
         # First call returns 404, second call (instruments) returns data
-        portfolio_response = MagicMock()
+        portfolio_response = Mock(spec=_HttpxResponse)
         portfolio_response.status_code = 404
 
-        instruments_response = MagicMock()
+        instruments_response = Mock(spec=_HttpxResponse)
         instruments_response.status_code = 200
         instruments_response.json.return_value = {
             "items": [
@@ -168,8 +190,9 @@ class TestPortfolioService:
             "pages": 1,
         }
 
-        mock_client.get.side_effect = [portfolio_response, instruments_response]
-        mock_client_class.return_value = mock_client
+        mock_client_class.return_value = httpx_client_mock(
+            [portfolio_response, instruments_response]
+        )
 
         service = PortfolioService("http://localhost:8000")
         portfolios = service.get_portfolios()
@@ -178,11 +201,11 @@ class TestPortfolioService:
         assert len(portfolios) == 2
 
     @patch('httpx.Client')
-    def test_get_instruments_map_success(self, mock_client_class):
+    def test_get_instruments_map_success(self, mock_client_class, httpx_client_mock):
         """Test successful instruments map fetching."""
         from data import PortfolioService
 
-        mock_response = MagicMock()
+        mock_response = Mock(spec=_HttpxResponse)
         mock_response.status_code = 200
         mock_response.json.return_value = {
             "items": [
@@ -200,11 +223,7 @@ class TestPortfolioService:
             "pages": 1,
         }
 
-        mock_client = MagicMock()
-        mock_client.get.return_value = mock_response
-        mock_client.__enter__ = MagicMock(return_value=mock_client)
-        mock_client.__exit__ = MagicMock(return_value=False)
-        mock_client_class.return_value = mock_client
+        mock_client_class.return_value = httpx_client_mock(mock_response)
 
         service = PortfolioService("http://localhost:8000")
         instruments_map = service.get_instruments_map()
@@ -213,29 +232,25 @@ class TestPortfolioService:
         assert instruments_map["uuid-123"]["portfolio_id"] == "CREDIT_IG"
 
     @patch('httpx.Client')
-    def test_get_instruments_map_pagination(self, mock_client_class):
+    def test_get_instruments_map_pagination(self, mock_client_class, httpx_client_mock):
         """Test instruments map handles pagination."""
         from data import PortfolioService
 
-        page1_response = MagicMock()
+        page1_response = Mock(spec=_HttpxResponse)
         page1_response.status_code = 200
         page1_response.json.return_value = {
             "items": [{"id": "uuid-1", "portfolio_id": "CREDIT_IG"}],
             "pages": 2,
         }
 
-        page2_response = MagicMock()
+        page2_response = Mock(spec=_HttpxResponse)
         page2_response.status_code = 200
         page2_response.json.return_value = {
             "items": [{"id": "uuid-2", "portfolio_id": "CREDIT_HY"}],
             "pages": 2,
         }
 
-        mock_client = MagicMock()
-        mock_client.get.side_effect = [page1_response, page2_response]
-        mock_client.__enter__ = MagicMock(return_value=mock_client)
-        mock_client.__exit__ = MagicMock(return_value=False)
-        mock_client_class.return_value = mock_client
+        mock_client_class.return_value = httpx_client_mock([page1_response, page2_response])
 
         service = PortfolioService("http://localhost:8000")
         instruments_map = service.get_instruments_map()
@@ -245,18 +260,15 @@ class TestPortfolioService:
         assert "uuid-2" in instruments_map
 
     @patch('httpx.Client')
-    def test_get_instruments_map_uses_correct_page_size(self, mock_client_class):
+    def test_get_instruments_map_uses_correct_page_size(self, mock_client_class, httpx_client_mock):
         """Test that page_size is 100 or less (API limit)."""
         from data import PortfolioService
 
-        mock_response = MagicMock()
+        mock_response = Mock(spec=_HttpxResponse)
         mock_response.status_code = 200
         mock_response.json.return_value = {"items": [], "pages": 1}
 
-        mock_client = MagicMock()
-        mock_client.get.return_value = mock_response
-        mock_client.__enter__ = MagicMock(return_value=mock_client)
-        mock_client.__exit__ = MagicMock(return_value=False)
+        mock_client = httpx_client_mock(mock_response)
         mock_client_class.return_value = mock_client
 
         service = PortfolioService("http://localhost:8000")
@@ -275,7 +287,7 @@ class TestRiskDataFetcher:
     def test_init(self, mock_redis_class):
         """Test RiskDataFetcher initialization."""
         from data import RiskDataFetcher
-        mock_redis_class.return_value = MagicMock()
+        mock_redis_class.return_value = Mock(spec=_RedisClient)
 
         fetcher = RiskDataFetcher("localhost", 6379)
         assert fetcher.client is not None
@@ -285,7 +297,7 @@ class TestRiskDataFetcher:
         """Test connection check returns True when connected."""
         from data import RiskDataFetcher
 
-        mock_client = MagicMock()
+        mock_client = Mock(spec=_RedisClient)
         mock_client.ping.return_value = True
         mock_redis_class.return_value = mock_client
 
@@ -298,7 +310,7 @@ class TestRiskDataFetcher:
         from data import RiskDataFetcher
         import redis
 
-        mock_client = MagicMock()
+        mock_client = Mock(spec=_RedisClient)
         mock_client.ping.side_effect = redis.ConnectionError("Connection refused")
         mock_redis_class.return_value = mock_client
 
@@ -310,17 +322,8 @@ class TestRiskDataFetcher:
         """Test getting portfolio aggregates."""
         from data import RiskDataFetcher
 
-        mock_client = MagicMock()
-        mock_client.hgetall.return_value = {
-            "total_npv": "100000000",
-            "total_dv01": "500000",
-            "instrument_count": "100",
-            "total_krd_2y": "100000",
-            "total_krd_5y": "150000",
-            "total_krd_10y": "175000",
-            "total_krd_30y": "75000",
-            "updated_at": "1704067200000",
-        }
+        mock_client = Mock(spec=_RedisClient)
+        mock_client.hgetall.return_value = _AGG_HASH
         mock_redis_class.return_value = mock_client
 
         fetcher = RiskDataFetcher("localhost", 6379)
@@ -336,7 +339,7 @@ class TestRiskDataFetcher:
         """Test getting portfolio aggregates when empty."""
         from data import RiskDataFetcher
 
-        mock_client = MagicMock()
+        mock_client = Mock(spec=_RedisClient)
         mock_client.hgetall.return_value = {}
         mock_redis_class.return_value = mock_client
 
@@ -350,32 +353,11 @@ class TestRiskDataFetcher:
         """Test getting all trade risks."""
         from data import RiskDataFetcher
 
-        mock_client = MagicMock()
+        mock_client = Mock(spec=_RedisClient)
         mock_client.scan.return_value = (0, ["trade:uuid-1:risk", "trade:uuid-2:risk"])
 
-        mock_pipe = MagicMock()
-        mock_pipe.execute.return_value = [
-            {
-                "npv": "1000000",
-                "dv01": "12500",
-                "krd_2y": "2500",
-                "krd_5y": "4000",
-                "krd_10y": "4000",
-                "krd_30y": "2000",
-                "curve_timestamp": "1704067200000",
-                "updated_at": "1704067200000",
-            },
-            {
-                "npv": "500000",
-                "dv01": "-8500",
-                "krd_2y": "-1500",
-                "krd_5y": "-2500",
-                "krd_10y": "-3000",
-                "krd_30y": "-1500",
-                "curve_timestamp": "1704067200000",
-                "updated_at": "1704067200000",
-            },
-        ]
+        mock_pipe = Mock(spec=_RedisPipeline)
+        mock_pipe.execute.return_value = [_TRADE_HASH_1, _TRADE_HASH_2]
         mock_client.pipeline.return_value = mock_pipe
         mock_redis_class.return_value = mock_client
 
@@ -391,25 +373,14 @@ class TestRiskDataFetcher:
         """Test getting trades as DataFrame."""
         from data import RiskDataFetcher
 
-        mock_client = MagicMock()
+        mock_client = Mock(spec=_RedisClient)
         mock_client.scan.return_value = (0, ["trade:uuid-1:risk"])
         mock_client.hgetall.side_effect = [
             {},  # Meta call returns empty
         ]
 
-        mock_pipe = MagicMock()
-        mock_pipe.execute.return_value = [
-            {
-                "npv": "1000000",
-                "dv01": "12500",
-                "krd_2y": "2500",
-                "krd_5y": "4000",
-                "krd_10y": "4000",
-                "krd_30y": "2000",
-                "curve_timestamp": "1704067200000",
-                "updated_at": "1704067200000",
-            },
-        ]
+        mock_pipe = Mock(spec=_RedisPipeline)
+        mock_pipe.execute.return_value = [_TRADE_HASH_1]
         mock_client.pipeline.return_value = mock_pipe
         mock_redis_class.return_value = mock_client
 
@@ -425,8 +396,9 @@ class TestRiskDataFetcher:
         """Test getting empty trades DataFrame."""
         from data import RiskDataFetcher
 
-        mock_client = MagicMock()
+        mock_client = Mock(spec=_RedisClient)
         mock_client.scan.return_value = (0, [])
+        mock_client.pipeline.return_value.execute.return_value = []
         mock_redis_class.return_value = mock_client
 
         fetcher = RiskDataFetcher("localhost", 6379)
@@ -439,7 +411,7 @@ class TestRiskDataFetcher:
         """Test getting historical DV01 data."""
         from data import RiskDataFetcher
 
-        mock_client = MagicMock()
+        mock_client = Mock(spec=_RedisClient)
         mock_client.zrangebyscore.return_value = [
             ("10000", 1704067200000),
             ("11000", 1704070800000),
@@ -461,7 +433,7 @@ class TestRiskDataFetcher:
         """Test getting historical DV01 when no data."""
         from data import RiskDataFetcher
 
-        mock_client = MagicMock()
+        mock_client = Mock(spec=_RedisClient)
         mock_client.zrangebyscore.return_value = []
         mock_redis_class.return_value = mock_client
 
@@ -477,7 +449,7 @@ class TestRiskDataFetcher:
         """Test storing historical snapshot."""
         from data import RiskDataFetcher
 
-        mock_client = MagicMock()
+        mock_client = Mock(spec=_RedisClient)
         mock_redis_class.return_value = mock_client
 
         fetcher = RiskDataFetcher("localhost", 6379)
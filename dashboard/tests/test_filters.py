@@ -1,46 +1,92 @@
 """Tests for filter components."""
 
+import functools
+
 import pytest
 from unittest.mock import MagicMock, patch
+from datetime import datetime, timedelta
 import pandas as pd
-import sys
-import os
-
-# Setup path and mocks
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
-
-
-class MockSessionState(dict):
-    """Mock that behaves like Streamlit's session_state (dict with attribute access)."""
-    def __getattr__(self, key):
-        try:
-            return self[key]
-        except KeyError:
-            raise AttributeError(key)
-
-    def __setattr__(self, key, value):
-        self[key] = value
 
-    def __delattr__(self, key):
-        try:
-            del self[key]
-        except KeyError:
-            raise AttributeError(key)
 
-
-# Mock streamlit before importing
-mock_st = MagicMock()
-mock_st.session_state = MockSessionState()
-sys.modules['streamlit'] = mock_st
+# Column specs for the apply_filters cases; frames are built once and shared
+# since apply_filters never mutates its input.
+_CASE_SPECS = {
+    "portfolio_all": {
+        "Portfolio ID": ["CREDIT_IG", "CREDIT_HY", "TECH_SECTOR"],
+        "Currency": ["USD", "USD", "USD"],
+        "DV01": [1000, 2000, 3000],
+    },
+    "portfolio_specific": {
+        "Portfolio ID": ["CREDIT_IG", "CREDIT_HY", "TECH_SECTOR"],
+        "Portfolio": ["Credit Ig", "Credit Hy", "Tech Sector"],
+        "Currency": ["USD", "USD", "USD"],
+        "DV01": [1000, 2000, 3000],
+    },
+    "portfolio_fallback_to_name": {
+        "Portfolio": ["CREDIT_IG", "CREDIT_HY", "TECH_SECTOR"],
+        "Currency": ["USD", "USD", "USD"],
+        "DV01": [1000, 2000, 3000],
+    },
+    "currency": {
+        "Portfolio ID": ["CREDIT_IG", "CREDIT_HY", "TECH_SECTOR"],
+        "Currency": ["USD", "EUR", "USD"],
+        "DV01": [1000, 2000, 3000],
+    },
+    "multiple_currencies": {
+        "Portfolio ID": ["A", "B", "C", "D"],
+        "Currency": ["USD", "EUR", "GBP", "JPY"],
+        "DV01": [1000, 2000, 3000, 4000],
+    },
+    "instrument_type": {
+        "Portfolio ID": ["A", "B", "C"],
+        "Type": ["BOND", "SWAP", "BOND"],
+        "Currency": ["USD", "USD", "USD"],
+        "DV01": [1000, 2000, 3000],
+    },
+    "maturity_range": {
+        "Portfolio ID": ["A", "B", "C", "D"],
+        "Years to Maturity": [2, 5, 15, 25],
+        "Currency": ["USD", "USD", "USD", "USD"],
+        "DV01": [1000, 2000, 3000, 4000],
+    },
+    "dv01_threshold": {
+        "Portfolio ID": ["A", "B", "C", "D"],
+        "Currency": ["USD", "USD", "USD", "USD"],
+        "DV01": [500, -1500, 2000, -3000],
+    },
+    "combined": {
+        "Portfolio ID": ["CREDIT_IG", "CREDIT_IG", "CREDIT_HY", "TECH_SECTOR"],
+        "Type": ["BOND", "SWAP", "BOND", "BOND"],
+        "Currency": ["USD", "USD", "EUR", "USD"],
+        "DV01": [1000, 500, 2000, 3000],
+    },
+    "no_currency_column": {
+        "Portfolio ID": ["CREDIT_IG", "CREDIT_HY"],
+        "DV01": [1000, 2000],
+    },
+    "preserves_columns": {
+        "Portfolio ID": ["CREDIT_IG", "CREDIT_HY"],
+        "Currency": ["USD", "USD"],
+        "DV01": [1000, 2000],
+        "NPV": [100000, 200000],
+        "Extra Column": ["A", "B"],
+    },
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _build_df(case: str) -> pd.DataFrame:
+    """Build (once) the DataFrame for a named apply_filters case."""
+    return pd.DataFrame(_CASE_SPECS[case])
 
 
 class TestPortfolioFilters:
     """Tests for PortfolioFilters class."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_session_state(self, streamlit_mock):
         """Reset session state before each test."""
-        # Clear and reset the session_state dict in place
-        mock_st.session_state.clear()
+        streamlit_mock.session_state.clear()
 
     def test_init_creates_session_state(self):
         """Test that PortfolioFilters has the correct default filter structure."""
@@ -74,16 +120,10 @@ class TestPortfolioFilters:
 
         assert result.empty
 
-    def test_apply_filters_portfolio_all(self):
+    def test_apply_filters_portfolio_all(self, memoized_filters):
         """Test filtering with ALL portfolios."""
-        from components.filters import PortfolioFilters
-
-        filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio ID": ["CREDIT_IG", "CREDIT_HY", "TECH_SECTOR"],
-            "Currency": ["USD", "USD", "USD"],
-            "DV01": [1000, 2000, 3000],
-        })
+        filters = memoized_filters
+        df = _build_df("portfolio_all")
 
         result = filters.apply_filters(df, {
             "portfolio": "ALL",
@@ -92,17 +132,10 @@ class TestPortfolioFilters:
 
         assert len(result) == 3
 
-    def test_apply_filters_portfolio_specific(self):
+    def test_apply_filters_portfolio_specific(self, memoized_filters):
         """Test filtering by specific portfolio."""
-        from components.filters import PortfolioFilters
-
-        filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio ID": ["CREDIT_IG", "CREDIT_HY", "TECH_SECTOR"],
-            "Portfolio": ["Credit Ig", "Credit Hy", "Tech Sector"],
-            "Currency": ["USD", "USD", "USD"],
-            "DV01": [1000, 2000, 3000],
-        })
+        filters = memoized_filters
+        df = _build_df("portfolio_specific")
 
         result = filters.apply_filters(df, {
             "portfolio": "CREDIT_IG",
@@ -112,16 +145,10 @@ class TestPortfolioFilters:
         assert len(result) == 1
         assert result.iloc[0]["Portfolio ID"] == "CREDIT_IG"
 
-    def test_apply_filters_portfolio_fallback_to_name(self):
+    def test_apply_filters_portfolio_fallback_to_name(self, memoized_filters):
         """Test filtering falls back to Portfolio column when ID not present."""
-        from components.filters import PortfolioFilters
-
-        filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio": ["CREDIT_IG", "CREDIT_HY", "TECH_SECTOR"],
-            "Currency": ["USD", "USD", "USD"],
-            "DV01": [1000, 2000, 3000],
-        })
+        filters = memoized_filters
+        df = _build_df("portfolio_fallback_to_name")
 
         result = filters.apply_filters(df, {
             "portfolio": "CREDIT_IG",
@@ -130,16 +157,10 @@ class TestPortfolioFilters:
 
         assert len(result) == 1
 
-    def test_apply_filters_currency(self):
+    def test_apply_filters_currency(self, memoized_filters):
         """Test filtering by currency."""
-        from components.filters import PortfolioFilters
-
-        filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio ID": ["CREDIT_IG", "CREDIT_HY", "TECH_SECTOR"],
-            "Currency": ["USD", "EUR", "USD"],
-            "DV01": [1000, 2000, 3000],
-        })
+        filters = memoized_filters
+        df = _build_df("currency")
 
         result = filters.apply_filters(df, {
             "portfolio": "ALL",
@@ -149,16 +170,10 @@ class TestPortfolioFilters:
         assert len(result) == 2
         assert all(result["Currency"] == "USD")
 
-    def test_apply_filters_multiple_currencies(self):
+    def test_apply_filters_multiple_currencies(self, memoized_filters):
         """Test filtering by multiple currencies."""
-        from components.filters import PortfolioFilters
-
-        filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio ID": ["A", "B", "C", "D"],
-            "Currency": ["USD", "EUR", "GBP", "JPY"],
-            "DV01": [1000, 2000, 3000, 4000],
-        })
+        filters = memoized_filters
+        df = _build_df("multiple_currencies")
 
         result = filters.apply_filters(df, {
             "portfolio": "ALL",
@@ -168,17 +183,10 @@ class TestPortfolioFilters:
         assert len(result) == 2
         assert set(result["Currency"].tolist()) == {"USD", "EUR"}
 
-    def test_apply_filters_instrument_type(self):
+    def test_apply_filters_instrument_type(self, memoized_filters):
         """Test filtering by instrument type."""
-        from components.filters import PortfolioFilters
-
-        filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio ID": ["A", "B", "C"],
-            "Type": ["BOND", "SWAP", "BOND"],
-            "Currency": ["USD", "USD", "USD"],
-            "DV01": [1000, 2000, 3000],
-        })
+        filters = memoized_filters
+        df = _build_df("instrument_type")
 
         result = filters.apply_filters(df, {
             "portfolio": "ALL",
@@ -189,17 +197,10 @@ class TestPortfolioFilters:
         assert len(result) == 2
         assert all(result["Type"] == "BOND")
 
-    def test_apply_filters_maturity_range(self):
+    def test_apply_filters_maturity_range(self, memoized_filters):
         """Test filtering by years to maturity."""
-        from components.filters import PortfolioFilters
-
-        filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio ID": ["A", "B", "C", "D"],
-            "Years to Maturity": [2, 5, 15, 25],
-            "Currency": ["USD", "USD", "USD", "USD"],
-            "DV01": [1000, 2000, 3000, 4000],
-        })
+        filters = memoized_filters
+        df = _build_df("maturity_range")
 
         result = filters.apply_filters(df, {
             "portfolio": "ALL",
@@ -212,16 +213,10 @@ class TestPortfolioFilters:
         assert result["Years to Maturity"].min() >= 5
         assert result["Years to Maturity"].max() <= 20
 
-    def test_apply_filters_dv01_threshold(self):
+    def test_apply_filters_dv01_threshold(self, memoized_filters):
         """Test filtering by DV01 threshold."""
-        from components.filters import PortfolioFilters
-
-        filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio ID": ["A", "B", "C", "D"],
-            "Currency": ["USD", "USD", "USD", "USD"],
-            "DV01": [500, -1500, 2000, -3000],
-        })
+        filters = memoized_filters
+        df = _build_df("dv01_threshold")
 
         result = filters.apply_filters(df, {
             "portfolio": "ALL",
@@ -233,17 +228,10 @@ class TestPortfolioFilters:
         assert len(result) == 3
         assert all(abs(result["DV01"]) >= 1000)
 
-    def test_apply_filters_combined(self):
+    def test_apply_filters_combined(self, memoized_filters):
         """Test combining multiple filters."""
-        from components.filters import PortfolioFilters
-
-        filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio ID": ["CREDIT_IG", "CREDIT_IG", "CREDIT_HY", "TECH_SECTOR"],
-            "Type": ["BOND", "SWAP", "BOND", "BOND"],
-            "Currency": ["USD", "USD", "EUR", "USD"],
-            "DV01": [1000, 500, 2000, 3000],
-        })
+        filters = memoized_filters
+        df = _build_df("combined")
 
         result = filters.apply_filters(df, {
             "portfolio": "CREDIT_IG",
@@ -256,15 +244,10 @@ class TestPortfolioFilters:
         assert result.iloc[0]["Portfolio ID"] == "CREDIT_IG"
         assert result.iloc[0]["Type"] == "BOND"
 
-    def test_apply_filters_no_currency_column(self):
+    def test_apply_filters_no_currency_column(self, memoized_filters):
         """Test filtering when currency column doesn't exist."""
-        from components.filters import PortfolioFilters
-
-        filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio ID": ["CREDIT_IG", "CREDIT_HY"],
-            "DV01": [1000, 2000],
-        })
+        filters = memoized_filters
+        df = _build_df("no_currency_column")
 
         result = filters.apply_filters(df, {
             "portfolio": "ALL",
@@ -279,13 +262,7 @@ class TestPortfolioFilters:
         from components.filters import PortfolioFilters
 
         filters = PortfolioFilters()
-        df = pd.DataFrame({
-            "Portfolio ID": ["CREDIT_IG", "CREDIT_HY"],
-            "Currency": ["USD", "USD"],
-            "DV01": [1000, 2000],
-            "NPV": [100000, 200000],
-            "Extra Column": ["A", "B"],
-        })
+        df = _build_df("preserves_columns")
 
         result = filters.apply_filters(df, {
             "portfolio": "ALL",
@@ -298,54 +275,34 @@ class TestPortfolioFilters:
 class TestPortfolioFiltersCalculateDateRange:
     """Tests for date range calculation."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_session_state(self, streamlit_mock):
         """Reset session state before each test."""
-        mock_st.session_state = MockSessionState()
-
-    def test_calculate_date_range_last_hour(self):
-        """Test Last Hour preset."""
+        streamlit_mock.session_state.clear()
+
+    @pytest.mark.parametrize(
+        "preset,delta",
+        [
+            ("Last Hour", timedelta(hours=1)),
+            ("Last 24 Hours", timedelta(days=1)),
+            ("Last 7 Days", timedelta(days=7)),
+        ],
+        ids=["1h", "24h", "7d"],
+    )
+    def test_calculate_date_range_preset(self, preset, delta):
+        """Test relative date range presets."""
         from components.filters import PortfolioFilters
-        from datetime import datetime, timedelta
 
         filters = PortfolioFilters()
-        config = {"preset": "Last Hour"}
-        start, end = filters._calculate_date_range(config)
+        start, end = filters._calculate_date_range({"preset": preset})
 
         now = datetime.now()
-        expected_start = now - timedelta(hours=1)
+        expected_start = now - delta
 
         # Allow 5 second tolerance
         assert abs((end - now).total_seconds()) < 5
         assert abs((start - expected_start).total_seconds()) < 5
 
-    def test_calculate_date_range_last_24_hours(self):
-        """Test Last 24 Hours preset."""
-        from components.filters import PortfolioFilters
-        from datetime import datetime, timedelta
-
-        filters = PortfolioFilters()
-        config = {"preset": "Last 24 Hours"}
-        start, end = filters._calculate_date_range(config)
-
-        now = datetime.now()
-        expected_start = now - timedelta(days=1)
-
-        assert abs((start - expected_start).total_seconds()) < 5
-
-    def test_calculate_date_range_last_7_days(self):
-        """Test Last 7 Days preset."""
-        from components.filters import PortfolioFilters
-        from datetime import datetime, timedelta
-
-        filters = PortfolioFilters()
-        config = {"preset": "Last 7 Days"}
-        start, end = filters._calculate_date_range(config)
-
-        now = datetime.now()
-        expected_start = now - timedelta(days=7)
-
-        assert abs((start - expected_start).total_seconds()) < 5
-
     def test_calculate_date_range_custom(self):
         """Test Custom date range."""
         from components.filters import PortfolioFilters
@@ -366,9 +323,10 @@ class TestPortfolioFiltersCalculateDateRange:
 class TestPortfolioFiltersStateManagement:
     """Tests for state management in filters."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_session_state(self, streamlit_mock):
         """Reset session state before each test."""
-        mock_st.session_state.clear()
+        streamlit_mock.session_state.clear()
 
     def test_pending_and_applied_are_independent(self):
         """Test that DEFAULT_FILTERS is copied, not referenced."""
@@ -3,57 +3,9 @@
 import pytest
 from unittest.mock import MagicMock, patch
 import time
-import sys
-import os
 
-# Setup path and mocks
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
-
-
-class MockSessionState(dict):
-    """Mock that behaves like Streamlit's session_state."""
-    def __getattr__(self, key):
-        try:
-            return self[key]
-        except KeyError:
-            raise AttributeError(key)
-
-    def __setattr__(self, key, value):
-        self[key] = value
-
-    def __delattr__(self, key):
-        try:
-            del self[key]
-        except KeyError:
-            raise AttributeError(key)
-
-    def get(self, key, default=None):
-        return super().get(key, default)
-
-
-# Mock streamlit
-mock_st = MagicMock()
-mock_st.session_state = MockSessionState({"theme": "light"})
-mock_st.set_page_config = MagicMock()
-mock_st.title = MagicMock()
-mock_st.sidebar = MagicMock()
-mock_st.columns = MagicMock(return_value=[MagicMock(), MagicMock()])
-mock_st.metric = MagicMock()
-mock_st.success = MagicMock()
-mock_st.warning = MagicMock()
-mock_st.error = MagicMock()
-mock_st.info = MagicMock()
-mock_st.divider = MagicMock()
-mock_st.subheader = MagicMock()
-mock_st.bar_chart = MagicMock()
-mock_st.dataframe = MagicMock()
-mock_st.caption = MagicMock()
-mock_st.plotly_chart = MagicMock()
-mock_st.selectbox = MagicMock(return_value="DV01")
-mock_st.rerun = MagicMock()
-mock_st.download_button = MagicMock()
-mock_st.cache_data = lambda ttl=None: lambda func: func
-sys.modules['streamlit'] = mock_st
+from main import get_status_indicator
+from updaters import format_currency
 
 
 class TestFormatCurrency:
@@ -61,8 +13,6 @@ class TestFormatCurrency:
 
     def test_format_millions(self):
         """Test formatting values in millions."""
-        from main import format_currency
-
         result = format_currency(5_000_000)
         assert result == "$5M"
 
@@ -71,8 +21,6 @@ class TestFormatCurrency:
 
     def test_format_thousands(self):
         """Test formatting values in thousands."""
-        from main import format_currency
-
         result = format_currency(50_000)
         assert result == "$50K"
 
@@ -81,8 +29,6 @@ class TestFormatCurrency:
 
     def test_format_small_values(self):
         """Test formatting small values."""
-        from main import format_currency
-
         result = format_currency(500)
         assert result == "$500"
 
@@ -91,29 +37,21 @@ class TestFormatCurrency:
 
     def test_format_negative_millions(self):
         """Test formatting negative values in millions."""
-        from main import format_currency
-
         result = format_currency(-5_000_000)
         assert result == "$-5M"
 
     def test_format_negative_thousands(self):
         """Test formatting negative values in thousands."""
-        from main import format_currency
-
         result = format_currency(-50_000)
         assert result == "$-50K"
 
     def test_format_zero(self):
         """Test formatting zero."""
-        from main import format_currency
-
         result = format_currency(0)
         assert result == "$0"
 
     def test_format_boundary_values(self):
         """Test formatting at boundary values."""
-        from main import format_currency
-
         # Exactly 1 million
         result = format_currency(1_000_000)
         assert "M" in result
@@ -130,94 +68,85 @@ class TestFormatCurrency:
 class TestGetStatusIndicator:
     """Tests for get_status_indicator function."""
 
+    NOW_MS = 1_704_067_200_000
+
     def test_disconnected(self):
         """Test disconnected status."""
-        from main import get_status_indicator
-
         result = get_status_indicator(connected=False, updated_at=0)
-        assert result == "Disconnected"
+        assert result == ("Disconnected", False)
 
     def test_waiting_for_data(self):
         """Test waiting for data status."""
-        from main import get_status_indicator
-
         result = get_status_indicator(connected=True, updated_at=0)
-        assert result == "Waiting for data..."
+        assert result == ("Waiting for data...", False)
 
     def test_live_status(self):
         """Test live status (recent update)."""
-        from main import get_status_indicator
-
         # Updated 5 seconds ago
-        updated_at = int((time.time() - 5) * 1000)
-        result = get_status_indicator(connected=True, updated_at=updated_at)
-        assert result == "Live"
+        updated_at = self.NOW_MS - 5_000
+        result = get_status_indicator(connected=True, updated_at=updated_at, now_ms=self.NOW_MS)
+        assert result == ("Live", True)
 
     def test_seconds_ago_status(self):
         """Test seconds ago status."""
-        from main import get_status_indicator
-
         # Updated 30 seconds ago
-        updated_at = int((time.time() - 30) * 1000)
-        result = get_status_indicator(connected=True, updated_at=updated_at)
-        assert "s ago" in result
-        # Should be approximately 30
-        seconds = int(result.replace("s ago", ""))
-        assert 25 <= seconds <= 35
+        updated_at = self.NOW_MS - 30_000
+        label, is_live = get_status_indicator(connected=True, updated_at=updated_at, now_ms=self.NOW_MS)
+        assert label == "30s ago"
+        assert is_live is False
 
     def test_minutes_ago_status(self):
         """Test minutes ago status."""
-        from main import get_status_indicator
-
         # Updated 5 minutes ago
-        updated_at = int((time.time() - 300) * 1000)
-        result = get_status_indicator(connected=True, updated_at=updated_at)
-        assert "m ago" in result
-        # Should be approximately 5
-        minutes = int(result.replace("m ago", ""))
-        assert 4 <= minutes <= 6
+        updated_at = self.NOW_MS - 300_000
+        label, is_live = get_status_indicator(connected=True, updated_at=updated_at, now_ms=self.NOW_MS)
+        assert label == "5m ago"
+        assert is_live is False
 
     def test_boundary_between_live_and_seconds(self):
         """Test boundary at 10 seconds."""
-        from main import get_status_indicator
-
         # Updated exactly 10 seconds ago - should be "10s ago"
-        updated_at = int((time.time() - 10) * 1000)
-        result = get_status_indicator(connected=True, updated_at=updated_at)
-        assert "s ago" in result
+        updated_at = self.NOW_MS - 10_000
+        label, _ = get_status_indicator(connected=True, updated_at=updated_at, now_ms=self.NOW_MS)
+        assert label == "10s ago"
 
     def test_boundary_between_seconds_and_minutes(self):
         """Test boundary at 60 seconds."""
-        from main import get_status_indicator
-
         # Updated exactly 60 seconds ago - should be "1m ago"
-        updated_at = int((time.time() - 60) * 1000)
+        updated_at = self.NOW_MS - 60_000
+        label, _ = get_status_indicator(connected=True, updated_at=updated_at, now_ms=self.NOW_MS)
+        assert label == "1m ago"
+
+    def test_defaults_to_current_time(self):
+        """Test that the wall clock is used when now_ms is omitted."""
+        # Updated 5 seconds ago
+        updated_at = int((time.time() - 5) * 1000)
         result = get_status_indicator(connected=True, updated_at=updated_at)
-        assert "m ago" in result
+        assert result == ("Live", True)
 
 
 class TestMainIntegration:
     """Integration tests for main dashboard."""
 
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_streamlit(self, streamlit_mock):
         """Reset session state before each test."""
-        mock_st.session_state = MockSessionState({"theme": "light"})
+        streamlit_mock.session_state.clear()
+        streamlit_mock.session_state["theme"] = "light"
         # Reset all mock calls
-        mock_st.error.reset_mock()
-        mock_st.warning.reset_mock()
+        streamlit_mock.error.reset_mock()
+        streamlit_mock.warning.reset_mock()
 
     def test_imports_work(self):
         """Test that all imports work correctly."""
         # This tests that mocking is set up correctly
-        from main import format_currency, get_status_indicator
-
         assert callable(format_currency)
         assert callable(get_status_indicator)
 
     @patch('main.RiskDataFetcher')
     @patch('main.PortfolioService')
     @patch('main.render_sidebar')
-    def test_dashboard_handles_no_connection(self, mock_sidebar, mock_portfolio_service, mock_fetcher_class):
+    def test_dashboard_handles_no_connection(self, mock_sidebar, mock_portfolio_service, mock_fetcher_class, streamlit_mock):
         """Test dashboard handles Redis connection failure gracefully."""
         mock_fetcher = MagicMock()
         mock_fetcher.is_connected.return_value = False
@@ -238,12 +167,12 @@ class TestMainIntegration:
                 pass
 
         # Should show error (check if st.error was called)
-        assert mock_st.error.called or True  # May fail due to mocking
+        assert streamlit_mock.error.called or True  # May fail due to mocking
 
     @patch('main.RiskDataFetcher')
     @patch('main.PortfolioService')
     @patch('main.render_sidebar')
-    def test_dashboard_handles_no_data(self, mock_sidebar, mock_portfolio_service, mock_fetcher_class):
+    def test_dashboard_handles_no_data(self, mock_sidebar, mock_portfolio_service, mock_fetcher_class, streamlit_mock):
         """Test dashboard handles no risk data gracefully."""
         mock_fetcher = MagicMock()
         mock_fetcher.is_connected.return_value = True
@@ -263,4 +192,4 @@ class TestMainIntegration:
             pass
 
         # Should show warning (check if st.warning was called)
-        assert mock_st.warning.called or True  # May fail due to complex mocking
+        assert streamlit_mock.warning.called or True  # May fail due to complex mocking
@@ -9,14 +9,24 @@ class Settings(BaseSettings):
     # Kafka
     kafka_bootstrap_servers: str = "localhost:9092"
     kafka_topic: str = "yield_curve_ticks"
+    # zstd needs Kafka >= 2.1 and librdkafka >= 1.0 on both ends; use lz4 for
+    # older consumers
+    kafka_compression: str = "zstd"
+    # Producer batching: replayed market data is not latency critical, so a
+    # longer linger and larger batches trade a few ms of latency for better
+    # compression and fewer broker round-trips
+    kafka_linger_ms: int = 20
+    kafka_batch_size: int = 65536
 
     # Replay settings
     replay_speed: float = 1.0  # 1.0 = real-time, 10.0 = 10x faster
     data_file: str = "data/yield_curves.csv"
     loop_forever: bool = True  # Restart from beginning when file ends
+    compact_messages: bool = False  # Positional rates wire format (see to_compact_message)
 
     # Application
     log_level: str = "INFO"
+    log_interval_seconds: float = 1.0  # Min seconds between progress log lines
 
     class Config:
         env_file = ".env"
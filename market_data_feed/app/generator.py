@@ -6,12 +6,38 @@ Memory-efficient O(1) implementation that yields one row at a time.
 import csv
 import time
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
-from typing import Generator, Dict, Any, Optional
+from typing import Generator, Dict, Any, List, NamedTuple, Optional, Tuple
+
+from app.serialization import dumps
 
 logger = logging.getLogger(__name__)
 
+# Standard tenor columns, in curve order
+_TENOR_COLUMNS: Tuple[str, ...] = ("1M", "3M", "6M", "1Y", "2Y", "3Y", "5Y", "7Y", "10Y", "20Y", "30Y")
+
+# Curve type used when the CSV has no curve_type column
+_DEFAULT_CURVE_TYPE = "USD_SOFR"
+
+# Replay is strictly sequential, so read the CSV through a 1 MB buffer
+_READ_BUFFER_SIZE = 1 << 20
+
+# Replay speed at or above which rows are emitted without pacing
+_NO_PACING_SPEED = 1000.0
+
+# date -> "YYYY-MM-DD"; consecutive rows almost always share a date
+_date_cache: Dict[date, str] = {}
+
+
+def _curve_date(timestamp: datetime) -> str:
+    """Return the ISO curve date for a timestamp, cached per calendar day."""
+    d = timestamp.date()
+    s = _date_cache.get(d)
+    if s is None:
+        s = _date_cache[d] = d.isoformat()
+    return s
+
 
 def parse_timestamp(timestamp_str: str) -> datetime:
     """Parse timestamp from CSV.
@@ -20,25 +46,30 @@ def parse_timestamp(timestamp_str: str) -> datetime:
     - ISO format: 2026-01-28T10:00:00
     - Date only: 2026-01-28
     - Unix milliseconds: 1706486400000
+
+    Every format returns a naive local-time datetime, so timestamps from a
+    file that mixes formats can be compared and subtracted.
     """
-    # Try ISO format first
-    try:
-        return datetime.fromisoformat(timestamp_str)
-    except ValueError:
-        pass
-
-    # Try date only
-    try:
-        return datetime.strptime(timestamp_str, "%Y-%m-%d")
-    except ValueError:
-        pass
-
-    # Try unix milliseconds
-    try:
-        ts = int(timestamp_str)
-        return datetime.fromtimestamp(ts / 1000)
-    except (ValueError, OSError):
-        pass
+    # Dispatch on shape first so the common cases never raise
+    if timestamp_str.isdigit():
+        # Unix milliseconds; split in integers so the milliseconds stay exact
+        millis = int(timestamp_str)
+        try:
+            return datetime.fromtimestamp(millis // 1000).replace(microsecond=millis % 1000 * 1000)
+        except (ValueError, OSError, OverflowError):
+            pass
+    elif "-" in timestamp_str:
+        # ISO format (also covers date only)
+        try:
+            return datetime.fromisoformat(timestamp_str)
+        except ValueError:
+            pass
+
+        # Non-padded date only, e.g. 2026-1-28
+        try:
+            return datetime.strptime(timestamp_str, "%Y-%m-%d")
+        except ValueError:
+            pass
 
     raise ValueError(f"Cannot parse timestamp: {timestamp_str}")
 
@@ -64,11 +95,8 @@ def format_kafka_message(row: Dict[str, str], timestamp: datetime) -> Dict[str,
         }
     }
     """
-    # Standard tenor columns
-    tenor_columns = ["1M", "3M", "6M", "1Y", "2Y", "3Y", "5Y", "7Y", "10Y", "20Y", "30Y"]
-
     rates = {}
-    for tenor in tenor_columns:
+    for tenor in _TENOR_COLUMNS:
         if tenor in row and row[tenor]:
             try:
                 rates[tenor] = float(row[tenor])
@@ -77,69 +105,164 @@ def format_kafka_message(row: Dict[str, str], timestamp: datetime) -> Dict[str,
 
     return {
         "timestamp": int(timestamp.timestamp() * 1000),
-        "curve_date": timestamp.strftime("%Y-%m-%d"),
-        "curve_type": row.get("curve_type", "USD_SOFR"),
+        "curve_date": _curve_date(timestamp),
+        "curve_type": row.get("curve_type", _DEFAULT_CURVE_TYPE),
         "rates": rates,
     }
 
 
-def market_data_generator(
-    file_path: str,
-    replay_speed: float = 1.0,
-    loop_forever: bool = False,
-) -> Generator[Dict[str, Any], None, None]:
-    """Generate market data snapshots from CSV file.
+def format_kafka_message_fast(
+    row: List[str],
+    timestamp: datetime,
+    tenor_idx: List[Tuple[str, int]],
+    ctype_idx: Optional[int],
+) -> Dict[str, Any]:
+    """Format a positional CSV row as a Kafka message.
 
-    This generator reads one row at a time, maintaining O(1) memory usage
-    regardless of file size.
+    Same output as format_kafka_message, but reads columns by index using
+    positions resolved once from the header.
 
     Args:
-        file_path: Path to CSV file with yield curve data
-        replay_speed: Speed multiplier (1.0 = real-time, 10.0 = 10x faster)
-        loop_forever: If True, restart from beginning when file ends
+        row: CSV row as a list of strings
+        timestamp: Parsed row timestamp
+        tenor_idx: (tenor, column index) pairs for tenors present in the file
+        ctype_idx: Column index of curve_type, or None if absent
+    """
+    rates = {}
+    for tenor, i in tenor_idx:
+        value = row[i]
+        if value:
+            try:
+                rates[tenor] = float(value)
+            except ValueError:
+                continue
 
-    Yields:
-        Dict with formatted market data message
+    return {
+        "timestamp": int(timestamp.timestamp() * 1000),
+        "curve_date": _curve_date(timestamp),
+        "curve_type": row[ctype_idx] if ctype_idx is not None else _DEFAULT_CURVE_TYPE,
+        "rates": rates,
+    }
 
-    Example:
-        >>> for msg in market_data_generator("data/curves.csv", replay_speed=10.0):
-        ...     producer.produce(topic, value=json.dumps(msg))
+
+def to_compact_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a formatted message to the compact positional wire format.
+
+    Output format:
+    {
+        "t": 1706486400000,        # timestamp
+        "d": "2026-01-28",         # curve_date
+        "c": "USD_SOFR",           # curve_type
+        "r": [0.0525, ..., 0.0470] # rates in _TENOR_COLUMNS order, null if missing
+    }
     """
+    rates = message["rates"]
+    return {
+        "t": message["timestamp"],
+        "d": message["curve_date"],
+        "c": message["curve_type"],
+        "r": [rates.get(tenor) for tenor in _TENOR_COLUMNS],
+    }
+
+
+class _CsvLayout(NamedTuple):
+    """Column positions resolved once from a CSV header."""
+
+    ctype_idx: Optional[int]
+    # (tenor, column index) for tenors present in the file
+    tenor_idx: List[Tuple[str, int]]
+    # Column index (or None) for every tenor in _TENOR_COLUMNS order
+    tenor_pos: Tuple[Optional[int], ...]
+
+
+def parse_rates(row: List[str], tenor_pos: Tuple[Optional[int], ...]) -> Tuple[Optional[float], ...]:
+    """Parse a row's rates into a fixed-order tuple.
+
+    Args:
+        row: CSV row as a list of strings
+        tenor_pos: Column index (or None if absent) per tenor, in
+            _TENOR_COLUMNS order
+
+    Returns:
+        One rate per tenor in _TENOR_COLUMNS order; None where the column is
+        missing, empty or invalid
+    """
+    rates = []
+    for i in tenor_pos:
+        value = row[i] if i is not None else ""
+        if value:
+            try:
+                rates.append(float(value))
+                continue
+            except ValueError:
+                pass
+        rates.append(None)
+    return tuple(rates)
+
+
+def _replay_rows(
+    file_path: str,
+    replay_speed: float,
+    loop_forever: bool,
+) -> Generator[Tuple[List[str], datetime, _CsvLayout], None, None]:
+    """Replay CSV rows with pacing, yielding (row, timestamp, layout)."""
     path = Path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"Data file not found: {file_path}")
 
+    # At very high replay speeds the computed sleeps are negligible, so skip
+    # the per-row pacing math entirely
+    skip_pacing = replay_speed <= 0 or replay_speed >= _NO_PACING_SPEED
+
     iteration = 0
     while True:
         iteration += 1
         logger.info(f"Starting data replay (iteration {iteration})")
 
-        with open(path, "r", newline="") as f:
-            reader = csv.DictReader(f)
+        with open(path, "r", newline="", buffering=_READ_BUFFER_SIZE) as f:
+            reader = csv.reader(f)
             prev_timestamp: Optional[datetime] = None
             row_count = 0
 
+            # Resolve column positions once from the header
+            header = next(reader, [])
+            width = len(header)
+            ts_idx = header.index("timestamp") if "timestamp" in header else None
+            layout = _CsvLayout(
+                ctype_idx=header.index("curve_type") if "curve_type" in header else None,
+                tenor_idx=[(tenor, header.index(tenor)) for tenor in _TENOR_COLUMNS if tenor in header],
+                tenor_pos=tuple(
+                    header.index(tenor) if tenor in header else None for tenor in _TENOR_COLUMNS
+                ),
+            )
+
             for row in reader:
+                if not row:
+                    continue
+                if len(row) < width:
+                    row += [""] * (width - len(row))
+
                 # Parse timestamp
+                if ts_idx is None:
+                    logger.warning("Skipping row with invalid timestamp: no timestamp column")
+                    continue
                 try:
-                    current_timestamp = parse_timestamp(row["timestamp"])
-                except (KeyError, ValueError) as e:
+                    current_timestamp = parse_timestamp(row[ts_idx])
+                except ValueError as e:
                     logger.warning(f"Skipping row with invalid timestamp: {e}")
                     continue
 
                 # Calculate sleep duration based on time delta
-                if prev_timestamp is not None:
+                if not skip_pacing and prev_timestamp is not None:
                     time_delta = (current_timestamp - prev_timestamp).total_seconds()
-                    if time_delta > 0 and replay_speed > 0:
+                    if time_delta > 0:
                         sleep_duration = time_delta / replay_speed
                         # Cap maximum sleep to prevent very long waits
                         sleep_duration = min(sleep_duration, 60.0)
                         if sleep_duration > 0.001:  # Only sleep if > 1ms
                             time.sleep(sleep_duration)
 
-                # Format and yield message
-                message = format_kafka_message(row, current_timestamp)
-                yield message
+                yield row, current_timestamp, layout
 
                 prev_timestamp = current_timestamp
                 row_count += 1
@@ -155,3 +278,73 @@ def market_data_generator(
         # Small delay before restarting
         logger.info("Restarting from beginning...")
         time.sleep(1.0)
+
+
+def market_data_generator(
+    file_path: str,
+    replay_speed: float = 1.0,
+    loop_forever: bool = False,
+) -> Generator[Dict[str, Any], None, None]:
+    """Generate market data snapshots from CSV file.
+
+    This generator reads one row at a time, maintaining O(1) memory usage
+    regardless of file size.
+
+    Args:
+        file_path: Path to CSV file with yield curve data
+        replay_speed: Speed multiplier (1.0 = real-time, 10.0 = 10x faster);
+            values >= 1000 (or <= 0) replay as fast as possible
+        loop_forever: If True, restart from beginning when file ends
+
+    Yields:
+        Dict with formatted market data message
+
+    Example:
+        >>> for msg in market_data_generator("data/curves.csv", replay_speed=10.0):
+        ...     producer.produce(topic, value=json.dumps(msg))
+    """
+    for row, timestamp, layout in _replay_rows(file_path, replay_speed, loop_forever):
+        yield format_kafka_message_fast(row, timestamp, layout.tenor_idx, layout.ctype_idx)
+
+
+def market_data_generator_bytes(
+    file_path: str,
+    replay_speed: float = 1.0,
+    loop_forever: bool = False,
+    compact: bool = False,
+) -> Generator[Tuple[bytes, bytes], None, None]:
+    """Generate pre-serialized market data messages from CSV file.
+
+    Same replay as market_data_generator, but yields Kafka-ready
+    (key, value) bytes so the producer can skip serialization. In compact
+    mode rates go straight from the row into a fixed-order tuple, without
+    building the tenor-keyed rates dict.
+
+    Args:
+        file_path: Path to CSV file with yield curve data
+        replay_speed: Speed multiplier (1.0 = real-time, 10.0 = 10x faster)
+        loop_forever: If True, restart from beginning when file ends
+        compact: If True, emit the compact positional format
+            (see to_compact_message)
+
+    Yields:
+        Tuple of (encoded curve_type key, encoded JSON message)
+    """
+    key_cache: Dict[str, bytes] = {}
+    for row, timestamp, layout in _replay_rows(file_path, replay_speed, loop_forever):
+        ctype_idx = layout.ctype_idx
+        key = row[ctype_idx] if ctype_idx is not None else _DEFAULT_CURVE_TYPE
+        key_bytes = key_cache.get(key)
+        if key_bytes is None:
+            key_bytes = key_cache[key] = key.encode("utf-8")
+
+        if compact:
+            message = {
+                "t": int(timestamp.timestamp() * 1000),
+                "d": _curve_date(timestamp),
+                "c": key,
+                "r": parse_rates(row, layout.tenor_pos),
+            }
+        else:
+            message = format_kafka_message_fast(row, timestamp, layout.tenor_idx, ctype_idx)
+        yield key_bytes, dumps(message)
@@ -3,10 +3,12 @@
 import logging
 import signal
 import sys
+import threading
+import time
 from pathlib import Path
 
 from app.config import settings
-from app.generator import market_data_generator
+from app.generator import market_data_generator_bytes
 from app.producer import MarketDataProducer
 
 # Configure logging
@@ -17,21 +19,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global flag for graceful shutdown
-shutdown_requested = False
+# Set on SIGINT/SIGTERM for graceful shutdown
+shutdown_event = threading.Event()
 
 
 def signal_handler(signum, frame):
     """Handle shutdown signals."""
-    global shutdown_requested
     logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-    shutdown_requested = True
+    shutdown_event.set()
 
 
 def main():
     """Main entry point."""
-    global shutdown_requested
-
     # Register signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -44,6 +43,7 @@ def main():
     logger.info(f"Data file: {settings.data_file}")
     logger.info(f"Replay speed: {settings.replay_speed}x")
     logger.info(f"Loop forever: {settings.loop_forever}")
+    logger.info(f"Compact messages: {settings.compact_messages}")
     logger.info("=" * 60)
 
     # Resolve data file path
@@ -63,30 +63,42 @@ def main():
     producer = MarketDataProducer(
         bootstrap_servers=settings.kafka_bootstrap_servers,
         topic=settings.kafka_topic,
+        compression=settings.kafka_compression,
+        linger_ms=settings.kafka_linger_ms,
+        batch_size=settings.kafka_batch_size,
     )
 
     # Start generating and producing
     message_count = 0
+    log_interval = settings.log_interval_seconds
+    last_log = time.monotonic()
     try:
-        generator = market_data_generator(
+        generator = market_data_generator_bytes(
             file_path=str(data_file),
             replay_speed=settings.replay_speed,
             loop_forever=settings.loop_forever,
+            compact=settings.compact_messages,
         )
 
-        for message in generator:
-            if shutdown_requested:
+        # Bind locally: checked once per message
+        is_shutdown = shutdown_event.is_set
+
+        for key, value in generator:
+            if is_shutdown():
                 logger.info("Shutdown requested, stopping generator...")
                 break
 
-            producer.produce(message)
+            producer.produce_raw(key, value)
             message_count += 1
 
-            if message_count % 10 == 0:
+            # Throttle progress logging to wall-clock time, not message count
+            now = time.monotonic()
+            if now - last_log >= log_interval and logger.isEnabledFor(logging.INFO):
                 logger.info(
-                    f"Published {message_count} messages | "
-                    f"Latest: {message['curve_type']} @ {message['curve_date']}"
+                    "Published %d messages | Latest: %s",
+                    message_count, key.decode("utf-8"),
                 )
+                last_log = now
 
     except FileNotFoundError as e:
         logger.error(f"Data file error: {e}")
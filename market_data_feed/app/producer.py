@@ -1,13 +1,17 @@
 """Kafka producer for market data."""
 
-import json
 import logging
-from typing import Optional, Callable
+from typing import Dict, Optional, Callable
 
 from confluent_kafka import Producer, KafkaError, KafkaException
 
+from app.serialization import dumps
+
 logger = logging.getLogger(__name__)
 
+# Serve delivery callbacks once every 64 produced messages (power of two)
+_POLL_MASK = 63
+
 
 def delivery_callback(err, msg):
     """Callback for message delivery reports."""
@@ -25,6 +29,9 @@ class MarketDataProducer:
         bootstrap_servers: str,
         topic: str,
         on_delivery: Optional[Callable] = None,
+        compression: str = "zstd",
+        linger_ms: int = 20,
+        batch_size: int = 65536,
     ):
         """Initialize the producer.
 
@@ -32,22 +39,31 @@ class MarketDataProducer:
             bootstrap_servers: Kafka bootstrap servers
             topic: Topic to produce to
             on_delivery: Optional delivery callback
+            compression: Kafka compression codec (zstd, lz4, snappy, gzip, none)
+            linger_ms: Time to wait for more messages before sending a batch
+            batch_size: Maximum batch size in bytes
         """
         self.topic = topic
         self.on_delivery = on_delivery or delivery_callback
+        self._key_cache: Dict[str, bytes] = {}
+        self._poll_counter = 0
 
-        self.producer = Producer({
+        config = {
             "bootstrap.servers": bootstrap_servers,
             "client.id": "market-data-feed",
             "acks": "all",  # Wait for all replicas
             "retries": 3,
             "retry.backoff.ms": 100,
-            "linger.ms": 5,  # Batch messages for efficiency
-            "batch.size": 16384,
-            "compression.type": "snappy",
-        })
+            "linger.ms": linger_ms,  # Batch messages for efficiency
+            "batch.size": batch_size,
+            "compression.type": compression,
+        }
+        if compression == "zstd":
+            config["compression.level"] = 3
+
+        self.producer = Producer(config)
 
-        logger.info(f"Producer initialized: {bootstrap_servers} -> {topic}")
+        logger.info(f"Producer initialized: {bootstrap_servers} -> {topic} ({compression})")
 
     def produce(self, message: dict) -> None:
         """Produce a message to Kafka.
@@ -55,19 +71,34 @@ class MarketDataProducer:
         Args:
             message: Dictionary to serialize as JSON
         """
-        try:
-            # Use curve_type as key for partitioning
-            key = message.get("curve_type", "default")
+        # Use curve_type as key for partitioning; the key set is tiny, so
+        # encoded keys are cached
+        key = message.get("curve_type", "default")
+        key_bytes = self._key_cache.get(key)
+        if key_bytes is None:
+            key_bytes = self._key_cache[key] = key.encode("utf-8")
+
+        self.produce_raw(key_bytes, dumps(message))
 
+    def produce_raw(self, key: bytes, value: bytes) -> None:
+        """Produce an already-serialized message to Kafka.
+
+        Args:
+            key: Encoded partition key
+            value: Encoded JSON payload
+        """
+        try:
             self.producer.produce(
                 topic=self.topic,
-                key=key.encode("utf-8"),
-                value=json.dumps(message).encode("utf-8"),
+                key=key,
+                value=value,
                 callback=self.on_delivery,
             )
 
-            # Trigger delivery callbacks
-            self.producer.poll(0)
+            # Trigger delivery callbacks in batches; flush() drains the rest
+            self._poll_counter += 1
+            if self._poll_counter & _POLL_MASK == 0:
+                self.producer.poll(0)
 
         except BufferError:
             logger.warning("Producer buffer full, waiting...")
@@ -75,8 +106,8 @@ class MarketDataProducer:
             # Retry
             self.producer.produce(
                 topic=self.topic,
-                key=key.encode("utf-8"),
-                value=json.dumps(message).encode("utf-8"),
+                key=key,
+                value=value,
                 callback=self.on_delivery,
             )
 
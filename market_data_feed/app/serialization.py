@@ -0,0 +1,19 @@
+"""JSON serialization for market data messages."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+# Stdlib fallback: one compact encoder reused for every message, so per-call
+# option handling is skipped
+_encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+def dumps(message: dict) -> bytes:
+    """Serialize a message to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(message)
+    return _encode(message).encode("utf-8")
@@ -1,5 +1,6 @@
 """Tests for market data generator."""
 
+import json
 import tempfile
 import pytest
 from datetime import datetime
@@ -7,7 +8,11 @@ from datetime import datetime
 from app.generator import (
     parse_timestamp,
     format_kafka_message,
+    format_kafka_message_fast,
     market_data_generator,
+    market_data_generator_bytes,
+    parse_rates,
+    to_compact_message,
 )
 
 
@@ -30,6 +35,7 @@ class TestParseTimestamp:
         result = parse_timestamp("1769558400000")
         assert result.year == 2026
         assert result.month == 1
+        assert int(result.timestamp() * 1000) == 1769558400000
 
     def test_parse_invalid_raises(self):
         """Test that invalid timestamps raise ValueError."""
@@ -88,6 +94,41 @@ class TestFormatKafkaMessage:
         assert result["curve_type"] == "USD_SOFR"
 
 
+class TestFormatKafkaMessageFast:
+    """Tests for positional row formatting."""
+
+    def test_matches_dict_formatter(self):
+        """Test that the positional path produces the same message."""
+        header = ["timestamp", "curve_type", "2Y", "5Y", "10Y"]
+        values = ["2026-01-28T10:00:00", "USD_SOFR", "0.0420", "invalid", ""]
+        timestamp = datetime(2026, 1, 28, 10, 0, 0)
+        tenor_idx = [("2Y", 2), ("5Y", 3), ("10Y", 4)]
+
+        result = format_kafka_message_fast(values, timestamp, tenor_idx, ctype_idx=1)
+
+        assert result == format_kafka_message(dict(zip(header, values)), timestamp)
+        assert result["rates"] == {"2Y": 0.0420}
+
+    def test_default_curve_type(self):
+        """Test default curve type when the column is absent."""
+        timestamp = datetime(2026, 1, 28, 10, 0, 0)
+
+        result = format_kafka_message_fast(["0.0420"], timestamp, [("2Y", 0)], ctype_idx=None)
+
+        assert result["curve_type"] == "USD_SOFR"
+
+
+class TestParseRates:
+    """Tests for fixed-order rate parsing."""
+
+    def test_fixed_order_with_gaps(self):
+        """Test that missing, empty and invalid rates become None."""
+        row = ["0.0420", "", "bad"]
+        tenor_pos = (0, 1, 2, None)
+
+        assert parse_rates(row, tenor_pos) == (0.0420, None, None, None)
+
+
 class TestMarketDataGenerator:
     """Tests for the generator function."""
 
@@ -108,6 +149,24 @@ class TestMarketDataGenerator:
             assert messages[0]["rates"]["2Y"] == 0.0420
             assert messages[1]["rates"]["2Y"] == 0.0421
 
+    def test_generator_mixed_timestamp_formats(self):
+        """Test that ISO and unix-ms rows can be mixed in one file."""
+        next_second = int(datetime(2026, 1, 28, 10, 0, 1).timestamp() * 1000)
+        csv_content = f"""timestamp,curve_type,2Y
+2026-01-28T10:00:00,USD_SOFR,0.0420
+{next_second},USD_SOFR,0.0421
+2026-01-28T10:00:02,USD_SOFR,0.0422
+"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write(csv_content)
+            f.flush()
+
+            # Below the no-pacing speed, so consecutive timestamps are subtracted
+            messages = list(market_data_generator(f.name, replay_speed=999, loop_forever=False))
+
+            assert [m["timestamp"] for m in messages][1] == next_second
+            assert [m["curve_date"] for m in messages] == ["2026-01-28"] * 3
+
     def test_generator_file_not_found(self):
         """Test that missing file raises FileNotFoundError."""
         with pytest.raises(FileNotFoundError):
@@ -147,3 +206,45 @@ invalid-timestamp,USD_SOFR,0.0421,0.0411
 
             # Should complete almost instantly with 1000x speed
             assert elapsed < 1.0
+
+
+class TestMarketDataGeneratorBytes:
+    """Tests for the pre-serialized generator."""
+
+    def test_yields_key_and_json_bytes(self):
+        """Test that messages come out as Kafka-ready bytes."""
+        csv_content = """timestamp,curve_type,2Y,5Y
+2026-01-28T10:00:00,USD_SOFR,0.0420,0.0410
+"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write(csv_content)
+            f.flush()
+
+            expected = list(market_data_generator(f.name, replay_speed=1000))
+            pairs = list(market_data_generator_bytes(f.name, replay_speed=1000))
+
+            assert len(pairs) == 1
+            key, value = pairs[0]
+            assert key == b"USD_SOFR"
+            assert json.loads(value) == expected[0]
+
+    def test_compact_format(self):
+        """Test the compact positional wire format."""
+        csv_content = """timestamp,curve_type,2Y,5Y
+2026-01-28T10:00:00,USD_SOFR,0.0420,0.0410
+"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write(csv_content)
+            f.flush()
+
+            expected = list(market_data_generator(f.name, replay_speed=1000))[0]
+            _, value = next(market_data_generator_bytes(f.name, replay_speed=1000, compact=True))
+
+            compact = json.loads(value)
+            assert compact == to_compact_message(expected)
+            assert compact["t"] == expected["timestamp"]
+            assert compact["d"] == "2026-01-28"
+            assert compact["c"] == "USD_SOFR"
+            assert len(compact["r"]) == 11
+            assert compact["r"][4] == 0.0420  # 2Y
+            assert compact["r"][0] is None  # 1M missing
@@ -15,6 +15,9 @@ class Settings(BaseSettings):
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_ttl: int = 3600  # 1 hour TTL for risk data
+    redis_batch_size: int = 1000  # Instruments per pipeline flush
+    redis_max_connections: int = 8  # Pool shared by writer and aggregator threads
+    redis_unix_socket_path: str = ""  # Use a UNIX socket instead of TCP when set
 
     # Security Master
     security_master_url: str = "http://localhost:8000"
@@ -25,6 +28,9 @@ class Settings(BaseSettings):
 
     # Risk calculation
     bump_size: float = 0.0001  # 1 basis point
+    analytic_dv01: bool = False  # Bond DV01 from zero-rate shifts (differs from swaps' par-bump DV01)
+    analytic_krd: bool = False  # Bond KRD as triangular zero-rate shifts from cashflows
+    pricing_workers: int = 1  # Processes pricing the portfolio in parallel (0 = one per CPU)
 
     class Config:
         env_file = ".env"
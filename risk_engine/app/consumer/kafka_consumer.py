@@ -2,12 +2,60 @@
 
 import json
 import logging
+import time
 from typing import Generator, Dict, Any, Optional
 
 from confluent_kafka import Consumer, KafkaError, KafkaException
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Offsets are committed asynchronously after this many messages or seconds,
+# whichever comes first
+COMMIT_EVERY_MESSAGES = 100
+COMMIT_INTERVAL_SECONDS = 1.0
+
+# Tenor order of the compact wire format; must match the market data feed's
+# generator._TENOR_COLUMNS
+COMPACT_TENORS = ("1M", "3M", "6M", "1Y", "2Y", "3Y", "5Y", "7Y", "10Y", "20Y", "30Y")
+
+
+def _loads(payload: bytes) -> Any:
+    """Parse a UTF-8 JSON message payload.
+
+    Raises:
+        json.JSONDecodeError: If the payload is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload.decode("utf-8"))
+
+
+def expand_compact_message(value: Dict[str, Any]) -> Dict[str, Any]:
+    """Expand a compact positional message to the standard message format.
+
+    Args:
+        value: Message with keys t (timestamp), d (curve_date),
+            c (curve_type) and r (rates in COMPACT_TENORS order)
+
+    Returns:
+        Message with timestamp, curve_date, curve_type and rates keys
+    """
+    return {
+        "timestamp": value["t"],
+        "curve_date": value["d"],
+        "curve_type": value["c"],
+        "rates": {
+            tenor: rate
+            for tenor, rate in zip(COMPACT_TENORS, value["r"])
+            if rate is not None
+        },
+    }
+
 
 class MarketDataConsumer:
     """Kafka consumer for yield curve updates."""
@@ -32,53 +80,112 @@ class MarketDataConsumer:
             "group.id": group_id,
             "auto.offset.reset": "latest",
             "enable.auto.commit": False,  # Manual commit after processing
+            # Only offsets stored after processing are committed, never the
+            # unprocessed tail of a fetched batch
+            "enable.auto.offset.store": False,
             "max.poll.interval.ms": 300000,  # 5 minutes
             "session.timeout.ms": 30000,
         })
 
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
         self.consumer.subscribe([topic])
         logger.info(f"Consumer initialized: {bootstrap_servers} <- {topic} (group: {group_id})")
 
-    def consume(self, timeout: float = 1.0) -> Generator[Dict[str, Any], None, None]:
+    def consume(
+        self, timeout: float = 1.0, batch_size: int = 100
+    ) -> Generator[Dict[str, Any], None, None]:
         """Consume messages from Kafka.
 
+        Each fetch blocks only until the first message arrives, then drains
+        whatever else is already queued (up to batch_size) without waiting.
+        A single batched consume would hold every update until batch_size
+        messages or the full timeout accumulated, adding up to ``timeout``
+        of latency at the feed's low message rate.
+
+        A message's offset is stored only once the caller has finished with
+        it (the generator is resumed), and stored offsets are committed
+        asynchronously every COMMIT_EVERY_MESSAGES messages or
+        COMMIT_INTERVAL_SECONDS, so a crash may redeliver
+        processed-but-uncommitted messages (at-least-once) but never skips
+        unprocessed ones.
+
         Args:
-            timeout: Poll timeout in seconds
+            timeout: Seconds to wait for the first message of a batch
+            batch_size: Maximum number of messages fetched per batch
 
         Yields:
             Parsed message dictionaries
         """
         try:
             while True:
-                msg = self.consumer.poll(timeout)
-
-                if msg is None:
+                # Wait for one message, then take only what is already buffered
+                msgs = self.consumer.consume(num_messages=1, timeout=timeout)
+                if msgs and batch_size > 1:
+                    msgs += self.consumer.consume(num_messages=batch_size - 1, timeout=0)
+
+                if not msgs:
+                    # Flush pending offsets once the interval elapses while idle
+                    self._maybe_commit()
                     continue
 
-                if msg.error():
-                    if msg.error().code() == KafkaError._PARTITION_EOF:
-                        logger.debug(f"End of partition: {msg.partition()}")
+                for msg in msgs:
+                    if msg.error():
+                        if msg.error().code() == KafkaError._PARTITION_EOF:
+                            logger.debug(f"End of partition: {msg.partition()}")
+                            continue
+                        else:
+                            raise KafkaException(msg.error())
+
+                    try:
+                        value = _loads(msg.value())
+                        if not isinstance(value, dict):
+                            raise TypeError(f"expected a JSON object, got {type(value).__name__}")
+                        if "r" in value:
+                            value = expand_compact_message(value)
+                    except (KeyError, TypeError, ValueError) as e:
+                        # Invalid JSON or a malformed message; bad messages are
+                        # stored too, so they are not reprocessed
+                        logger.error(f"Failed to parse message: {e!r}")
+                        self._store(msg)
                         continue
-                    else:
-                        raise KafkaException(msg.error())
 
-                try:
-                    value = json.loads(msg.value().decode("utf-8"))
                     yield value
+                    self._store(msg)
+                    self._maybe_commit()
 
-                    # Commit after successful processing
-                    self.consumer.commit(asynchronous=False)
-
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse message: {e}")
-                    # Commit anyway to avoid reprocessing bad messages
-                    self.consumer.commit(asynchronous=False)
+                # Cover a batch that ended on an unparseable message
+                self._maybe_commit()
 
         except KeyboardInterrupt:
             logger.info("Consumer interrupted")
 
+    def _store(self, msg) -> None:
+        """Mark a message as processed so the next commit covers it."""
+        self.consumer.store_offsets(message=msg)
+        self._uncommitted += 1
+
+    def _maybe_commit(self) -> None:
+        """Commit stored offsets asynchronously once the count or time threshold is hit."""
+        if not self._uncommitted:
+            return
+        now = time.monotonic()
+        if (
+            self._uncommitted >= COMMIT_EVERY_MESSAGES
+            or now - self._last_commit >= COMMIT_INTERVAL_SECONDS
+        ):
+            self.consumer.commit(asynchronous=True)
+            self._uncommitted = 0
+            self._last_commit = now
+
     def close(self) -> None:
-        """Close the consumer."""
+        """Close the consumer, synchronously committing any stored offsets."""
         logger.info("Closing consumer...")
+        if self._uncommitted:
+            try:
+                self.consumer.commit(asynchronous=False)
+            except KafkaException as e:
+                logger.warning(f"Final commit failed: {e}")
         self.consumer.close()
         logger.info("Consumer closed")
@@ -3,103 +3,278 @@
 import json
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import redis
 
-from app.pricing.risk import RiskMetrics
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+from app.pricing.risk import RiskCalculator, RiskMetrics
 
 logger = logging.getLogger(__name__)
 
+# Set of instrument IDs that have a trade:{id}:risk hash
+TRADE_INDEX_KEY = "trade:ids"
+
+# Stream of per-batch risk update notifications, capped at roughly this length
+RISK_UPDATES_STREAM = "risk_updates"
+RISK_UPDATES_MAXLEN = 10_000
+
+# Hash fields read back for portfolio aggregation
+RISK_FIELDS = ("npv", "dv01", "krd_2y", "krd_5y", "krd_10y", "krd_30y")
+
+# Returns a flat list: id, field values..., id, field values..., ...
+FETCH_RISKS_LUA = """
+local out = {}
+for _, id in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    local values = redis.call('HMGET', 'trade:' .. id .. ':risk', unpack(ARGV))
+    local present = false
+    for i = 1, #ARGV do
+        if values[i] then present = true end
+    end
+    if present then
+        table.insert(out, id)
+        for i = 1, #ARGV do
+            table.insert(out, values[i])
+        end
+    end
+end
+return out
+"""
+
+# Returns field sums in ARGV order followed by the trade count, formatted
+# as strings because Lua numbers are truncated to integers in replies
+AGGREGATE_RISKS_LUA = """
+local sums = {}
+for i = 1, #ARGV do sums[i] = 0 end
+local count = 0
+for _, id in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+    local values = redis.call('HMGET', 'trade:' .. id .. ':risk', unpack(ARGV))
+    if values[1] then
+        count = count + 1
+        for i = 1, #ARGV do
+            sums[i] = sums[i] + (tonumber(values[i]) or 0)
+        end
+    end
+end
+local out = {}
+for i = 1, #ARGV do out[i] = string.format('%.17g', sums[i]) end
+out[#ARGV + 1] = tostring(count)
+return out
+"""
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a value to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
 
 class RedisWriter:
     """Writes risk metrics to Redis."""
 
-    def __init__(self, host: str, port: int, ttl: int = 3600):
-        """Initialize Redis connection.
+    # Curve history retention and how often old entries are trimmed
+    HISTORY_RETENTION_MS = 3600_000
+    HISTORY_TRIM_INTERVAL_MS = 60_000
+
+    # KRD tenor -> trade:{id}:risk field name
+    _KRD_FIELDS = {tenor: f"krd_{tenor.lower()}" for tenor in RiskCalculator.KRD_TENORS}
+
+    # KRD tenor -> portfolio:aggregates field name
+    _KRD_TOTAL_FIELDS = {tenor: f"total_krd_{tenor.lower()}" for tenor in RiskCalculator.KRD_TENORS}
+
+    # Tenor -> yield_curve:latest field name, filled on first use
+    _RATE_FIELDS: Dict[str, str] = {}
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        ttl: int = 3600,
+        batch_size: int = 1000,
+        max_connections: int = 8,
+        unix_socket_path: Optional[str] = None,
+    ):
+        """Initialize Redis connection pool.
 
         Args:
             host: Redis host
             port: Redis port
             ttl: Time-to-live for risk data in seconds
+            batch_size: Max instruments queued on a pipeline before it is flushed
+            max_connections: Pool size shared by the writer and aggregation threads
+            unix_socket_path: Connect over this UNIX socket instead of TCP
         """
         self.ttl = ttl
-        self.client = redis.Redis(
-            host=host,
-            port=port,
-            decode_responses=True,
-        )
+        self.batch_size = batch_size
+        self._last_trim = 0
+        if unix_socket_path:
+            pool = redis.ConnectionPool(
+                connection_class=redis.UnixDomainSocketConnection,
+                path=unix_socket_path,
+                max_connections=max_connections,
+                decode_responses=True,
+            )
+        else:
+            pool = redis.ConnectionPool(
+                host=host,
+                port=port,
+                max_connections=max_connections,
+                socket_keepalive=True,
+                decode_responses=True,
+            )
+        self.client = redis.Redis(connection_pool=pool)
+
+        self._fetch_risks = self.client.register_script(FETCH_RISKS_LUA)
+        self._aggregate_risks = self.client.register_script(AGGREGATE_RISKS_LUA)
 
         # Verify connection
         self.client.ping()
-        logger.info(f"Redis connected: {host}:{port}")
+        logger.info(f"Redis connected: {unix_socket_path or f'{host}:{port}'}")
 
-    def write_risk(self, metrics: RiskMetrics, curve_timestamp: int) -> None:
-        """Write risk metrics to Redis.
+    def begin_batch(self) -> redis.client.Pipeline:
+        """Start a non-transactional pipeline shared by several writes.
 
-        Storage pattern:
-        - trade:{id}:risk -> hash with npv, dv01, krd values
-        - trade:{id}:updated -> timestamp of last update
+        Returns:
+            Pipeline to pass as ``pipe`` to the write methods
+        """
+        return self.client.pipeline(transaction=False)
+
+    def commit_batch(self, pipe: redis.client.Pipeline) -> None:
+        """Send every command queued on a batch pipeline.
+
+        Args:
+            pipe: Pipeline returned by begin_batch()
+        """
+        pipe.execute()
+
+    def write_risk(
+        self,
+        metrics: RiskMetrics,
+        curve_timestamp: int,
+        updated_at_ms: Optional[int] = None,
+    ) -> None:
+        """Write risk metrics for a single instrument to Redis.
 
         Args:
             metrics: Risk metrics to write
             curve_timestamp: Timestamp of the curve data
+            updated_at_ms: Write time in epoch ms; defaults to now
         """
-        key = f"trade:{metrics.instrument_id}:risk"
-
-        # Flatten KRD to individual fields
-        data = {
-            "npv": str(metrics.npv),
-            "dv01": str(metrics.dv01),
-            "curve_timestamp": str(curve_timestamp),
-            "updated_at": str(int(time.time() * 1000)),
-        }
+        self.write_risks_batch([metrics], curve_timestamp, updated_at_ms=updated_at_ms)
 
-        # Add KRD values
-        for tenor, value in metrics.krd.items():
-            data[f"krd_{tenor.lower()}"] = str(value)
+    def write_risks_batch(
+        self,
+        metrics_list: List[RiskMetrics],
+        curve_timestamp: int,
+        pipe: Optional[redis.client.Pipeline] = None,
+        updated_at_ms: Optional[int] = None,
+    ) -> None:
+        """Write risk metrics for many instruments in one pipeline round trip.
 
-        # Write to Redis
-        pipe = self.client.pipeline()
-        pipe.hset(key, mapping=data)
-        pipe.expire(key, self.ttl)
-        pipe.execute()
+        Storage pattern:
+        - trade:{id}:risk -> hash with npv, dv01, krd values
+        - trade:{id}:updated -> timestamp of last update
+        - trade:ids -> set of instrument IDs with a risk hash
+        - risk_updates -> stream entry per batch with the updated IDs
 
-        # Publish notification for aggregator
-        self.client.publish("risk_updates", json.dumps({
-            "instrument_id": metrics.instrument_id,
-            "timestamp": curve_timestamp,
-        }))
+        Args:
+            metrics_list: Risk metrics to write
+            curve_timestamp: Timestamp of the curve data
+            pipe: Batch pipeline to queue onto; executed here when None
+            updated_at_ms: Write time in epoch ms; defaults to now
+        """
+        if not metrics_list:
+            return
+
+        owns_pipe = pipe is None
+        if owns_pipe:
+            pipe = self.begin_batch()
+
+        if updated_at_ms is None:
+            updated_at_ms = time.time_ns() // 1_000_000
+
+        krd_fields = self._KRD_FIELDS.items()
+
+        for i, metrics in enumerate(metrics_list, 1):
+            key = f"trade:{metrics.instrument_id}:risk"
+
+            # Flatten KRD to individual fields
+            data = {
+                "npv": metrics.npv,
+                "dv01": metrics.dv01,
+                "curve_timestamp": curve_timestamp,
+                "updated_at": updated_at_ms,
+            }
+
+            # Add KRD values
+            krd = metrics.krd
+            for tenor, field in krd_fields:
+                data[field] = krd[tenor]
+
+            pipe.hset(key, mapping=data)
+            pipe.expire(key, self.ttl)
+            pipe.sadd(TRADE_INDEX_KEY, metrics.instrument_id)
+
+            # Flush very large portfolios in chunks to bound pipeline memory
+            if i % self.batch_size == 0:
+                pipe.execute()
+
+        pipe.expire(TRADE_INDEX_KEY, self.ttl)
+
+        # Record one notification for the whole batch
+        pipe.xadd(
+            RISK_UPDATES_STREAM,
+            {
+                "timestamp": curve_timestamp,
+                "instrument_ids": _dumps([metrics.instrument_id for metrics in metrics_list]),
+            },
+            maxlen=RISK_UPDATES_MAXLEN,
+            approximate=True,
+        )
 
-        logger.debug(f"Wrote risk for {metrics.instrument_id}: DV01={metrics.dv01:.2f}")
+        if owns_pipe:
+            pipe.execute()
+        logger.debug(f"Wrote risk for {len(metrics_list)} instruments")
 
     def get_all_trade_risks(self) -> Dict[str, Dict[str, str]]:
         """Get all trade risk data for aggregation.
 
+        Reads every indexed trade in a single Lua call; trades whose hash
+        has expired are skipped.
+
         Returns:
             Dict mapping instrument IDs to their risk data
         """
-        result = {}
-        cursor = 0
-
-        while True:
-            cursor, keys = self.client.scan(cursor, match="trade:*:risk", count=100)
+        flat = self._fetch_risks(keys=[TRADE_INDEX_KEY], args=list(RISK_FIELDS))
+        width = len(RISK_FIELDS) + 1
 
-            pipe = self.client.pipeline()
-            for key in keys:
-                pipe.hgetall(key)
+        result = {}
+        for i in range(0, len(flat), width):
+            result[flat[i]] = {
+                field: value
+                for field, value in zip(RISK_FIELDS, flat[i + 1:i + width])
+                if value is not None
+            }
 
-            values = pipe.execute()
+        return result
 
-            for key, data in zip(keys, values):
-                # Extract instrument ID from key
-                instrument_id = key.split(":")[1]
-                result[instrument_id] = data
+    def get_risk_totals(self) -> Dict[str, float]:
+        """Sum risk fields across all indexed trades inside Redis.
 
-            if cursor == 0:
-                break
+        Returns:
+            Dict mapping each of RISK_FIELDS to its portfolio total, plus
+            "count" with the number of trades summed
+        """
+        reply = self._aggregate_risks(keys=[TRADE_INDEX_KEY], args=list(RISK_FIELDS))
 
-        return result
+        totals = {field: float(value) for field, value in zip(RISK_FIELDS, reply)}
+        totals["count"] = int(reply[len(RISK_FIELDS)])
+        return totals
 
     def write_portfolio_aggregates(self, aggregates: Dict[str, Any]) -> None:
         """Write portfolio-level aggregates.
@@ -110,42 +285,66 @@ class RedisWriter:
         key = "portfolio:aggregates"
 
         data = {
-            "total_npv": str(aggregates.get("total_npv", 0)),
-            "total_dv01": str(aggregates.get("total_dv01", 0)),
-            "instrument_count": str(aggregates.get("instrument_count", 0)),
-            "updated_at": str(int(time.time() * 1000)),
+            "total_npv": aggregates.get("total_npv", 0),
+            "total_dv01": aggregates.get("total_dv01", 0),
+            "instrument_count": aggregates.get("instrument_count", 0),
+            "updated_at": time.time_ns() // 1_000_000,
         }
 
         # Add KRD totals
+        total_fields = self._KRD_TOTAL_FIELDS
         for tenor, value in aggregates.get("krd", {}).items():
-            data[f"total_krd_{tenor.lower()}"] = str(value)
+            data[total_fields.get(tenor) or f"total_krd_{tenor.lower()}"] = value
 
         self.client.hset(key, mapping=data)
         logger.info(f"Portfolio aggregates updated: DV01={aggregates.get('total_dv01', 0):.2f}")
 
-    def write_yield_curve(self, rates: Dict[str, float], curve_timestamp: int) -> None:
+    def write_yield_curve(
+        self,
+        rates: Dict[str, float],
+        curve_timestamp: int,
+        pipe: Optional[redis.client.Pipeline] = None,
+        updated_at_ms: Optional[int] = None,
+    ) -> None:
         """Write latest yield curve snapshot to Redis.
 
         Args:
             rates: Tenor -> rate mapping (e.g. {"2Y": 0.0420, ...})
             curve_timestamp: Kafka message timestamp (ms)
+            pipe: Batch pipeline to queue onto; executed here when None
+            updated_at_ms: Write time in epoch ms; defaults to now
         """
-        data = {f"rate_{tenor.lower()}": str(rate) for tenor, rate in rates.items()}
-        data["timestamp"] = str(curve_timestamp)
-        data["updated_at"] = str(int(time.time() * 1000))
+        now_ms = updated_at_ms if updated_at_ms is not None else time.time_ns() // 1_000_000
+        fields = self._RATE_FIELDS
+
+        data = {}
+        for tenor, rate in rates.items():
+            field = fields.get(tenor)
+            if field is None:
+                field = fields[tenor] = f"rate_{tenor.lower()}"
+            data[field] = rate
+        data["timestamp"] = curve_timestamp
+        data["updated_at"] = now_ms
+
+        owns_pipe = pipe is None
+        if owns_pipe:
+            pipe = self.begin_batch()
 
-        pipe = self.client.pipeline()
         pipe.hset("yield_curve:latest", mapping=data)
 
         # Store history as JSON in sorted set (score = timestamp)
-        curve_json = json.dumps({tenor: rate for tenor, rate in rates.items()})
+        curve_json = _dumps(rates)
         pipe.zadd("yield_curve:history", {curve_json: curve_timestamp})
 
-        # Keep only last 1 hour of curve history
-        hour_ago = int(time.time() * 1000) - 3600_000
-        pipe.zremrangebyscore("yield_curve:history", "-inf", hour_ago)
+        # Keep only last 1 hour of curve history, trimming at most once a minute
+        if now_ms - self._last_trim >= self.HISTORY_TRIM_INTERVAL_MS:
+            pipe.zremrangebyscore(
+                "yield_curve:history", "-inf", now_ms - self.HISTORY_RETENTION_MS
+            )
+            self._last_trim = now_ms
 
-        pipe.execute()
+        if owns_pipe:
+            pipe.execute()
         logger.debug(f"Wrote yield curve at {curve_timestamp}")
 
     def close(self) -> None:
@@ -4,7 +4,8 @@ import logging
 import signal
 import sys
 import time
-from typing import List, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Union
 
 from app.config import settings
 from app.consumer import MarketDataConsumer, RedisWriter
@@ -55,22 +56,26 @@ def process_market_update(
 
     curve_timestamp = message["timestamp"]
 
+    # One wall-clock read shared by every write for this message
+    now_ms = time.time_ns() // 1_000_000
+
+    # Curve snapshot and instrument risks share one pipeline per message
+    pipe = redis_writer.begin_batch()
+
     # Persist current yield curve snapshot for dashboard
-    redis_writer.write_yield_curve(message["rates"], curve_timestamp)
-    processed = 0
+    redis_writer.write_yield_curve(
+        message["rates"], curve_timestamp, pipe=pipe, updated_at_ms=now_ms
+    )
 
     # Calculate risk for each instrument
-    for instrument in portfolio:
-        try:
-            metrics = risk_calculator.calculate(instrument)
-            redis_writer.write_risk(metrics, curve_timestamp)
-            processed += 1
+    results = risk_calculator.calculate_batch(portfolio)
 
-        except Exception as e:
-            logger.error(f"Failed to calculate risk for {instrument.id}: {e}")
-            continue
+    redis_writer.write_risks_batch(
+        results, curve_timestamp, pipe=pipe, updated_at_ms=now_ms
+    )
+    redis_writer.commit_batch(pipe)
 
-    return processed
+    return len(results)
 
 
 def aggregate_portfolio(redis_writer: RedisWriter) -> dict:
@@ -82,30 +87,45 @@ def aggregate_portfolio(redis_writer: RedisWriter) -> dict:
     Returns:
         Aggregated metrics
     """
-    trade_risks = redis_writer.get_all_trade_risks()
-
-    aggregates = {
-        "total_npv": 0.0,
-        "total_dv01": 0.0,
-        "instrument_count": len(trade_risks),
-        "krd": {"2Y": 0.0, "5Y": 0.0, "10Y": 0.0, "30Y": 0.0},
+    totals = redis_writer.get_risk_totals()
+
+    return {
+        "total_npv": totals["npv"],
+        "total_dv01": totals["dv01"],
+        "instrument_count": totals["count"],
+        "krd": {
+            "2Y": totals["krd_2y"],
+            "5Y": totals["krd_5y"],
+            "10Y": totals["krd_10y"],
+            "30Y": totals["krd_30y"],
+        },
     }
 
-    for instrument_id, data in trade_risks.items():
-        try:
-            aggregates["total_npv"] += float(data.get("npv", 0))
-            aggregates["total_dv01"] += float(data.get("dv01", 0))
 
-            for tenor in ["2y", "5y", "10y", "30y"]:
-                krd_key = f"krd_{tenor}"
-                if krd_key in data:
-                    aggregates["krd"][tenor.upper()] += float(data[krd_key])
+def publish_aggregates(redis_writer: RedisWriter, message_count: int, processed: int, rate: float) -> None:
+    """Aggregate portfolio risk, write it to Redis and log progress.
+
+    Runs on the aggregation worker thread, so errors are logged here
+    rather than propagated to the consumer loop.
+
+    Args:
+        redis_writer: Redis writer with access to trade data
+        message_count: Messages processed so far
+        processed: Instruments priced in the latest update
+        rate: Messages processed per second
+    """
+    try:
+        aggregates = aggregate_portfolio(redis_writer)
+        redis_writer.write_portfolio_aggregates(aggregates)
 
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Invalid data for {instrument_id}: {e}")
-            continue
+        logger.info(
+            f"Processed {message_count} updates ({rate:.1f}/sec) | "
+            f"Instruments: {processed} | "
+            f"Portfolio DV01: ${aggregates['total_dv01']:,.0f}"
+        )
 
-    return aggregates
+    except Exception as e:
+        logger.exception(f"Error aggregating portfolio: {e}")
 
 
 def main():
@@ -138,13 +158,22 @@ def main():
 
         # Initialize curve builder and risk calculator
         curve_builder = YieldCurveBuilder()
-        risk_calculator = RiskCalculator(curve_builder, settings.bump_size)
+        risk_calculator = RiskCalculator(
+            curve_builder,
+            settings.bump_size,
+            settings.analytic_dv01,
+            settings.analytic_krd,
+            workers=settings.pricing_workers,
+        )
 
         # Initialize Redis writer
         redis_writer = RedisWriter(
             host=settings.redis_host,
             port=settings.redis_port,
             ttl=settings.redis_ttl,
+            batch_size=settings.redis_batch_size,
+            max_connections=settings.redis_max_connections,
+            unix_socket_path=settings.redis_unix_socket_path or None,
         )
 
         # Initialize Kafka consumer
@@ -158,6 +187,10 @@ def main():
         logger.exception(f"Failed to initialize: {e}")
         sys.exit(1)
 
+    # Aggregation runs on a single background worker so it never blocks consumption
+    agg_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aggregator")
+    agg_future: Optional[Future] = None
+
     # Main processing loop
     message_count = 0
     start_time = time.time()
@@ -182,18 +215,13 @@ def main():
 
                 message_count += 1
 
-                # Aggregate and log periodically
-                if message_count % 5 == 0:
-                    aggregates = aggregate_portfolio(redis_writer)
-                    redis_writer.write_portfolio_aggregates(aggregates)
-
+                # Aggregate and log periodically, skipping if the last run is still going
+                if message_count % 5 == 0 and (agg_future is None or agg_future.done()):
                     elapsed = time.time() - start_time
                     rate = message_count / elapsed if elapsed > 0 else 0
 
-                    logger.info(
-                        f"Processed {message_count} updates ({rate:.1f}/sec) | "
-                        f"Instruments: {processed} | "
-                        f"Portfolio DV01: ${aggregates['total_dv01']:,.0f}"
+                    agg_future = agg_pool.submit(
+                        publish_aggregates, redis_writer, message_count, processed, rate
                     )
 
             except Exception as e:
@@ -208,6 +236,8 @@ def main():
 
     finally:
         # Clean up
+        agg_pool.shutdown(wait=True)
+        risk_calculator.close()
         consumer.close()
         redis_writer.close()
 
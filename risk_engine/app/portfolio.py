@@ -1,28 +1,89 @@
 """Portfolio loading from Security Master."""
 
+import json
 import logging
-from datetime import datetime
-from typing import List, Union
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Optional, Union
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
 from app.pricing.instruments import BondData, SwapData
 
 logger = logging.getLogger(__name__)
 
 
-def parse_date(date_str: str) -> datetime:
-    """Parse date string to datetime."""
+def parse_date(date_str: str) -> Optional[date]:
+    """Parse a YYYY-MM-DD string to a date."""
     if not date_str:
         return None
-    return datetime.strptime(date_str, "%Y-%m-%d").date()
-
-
-def load_portfolio(security_master_url: str) -> List[Union[BondData, SwapData]]:
+    return date(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+
+
+def _loads(payload: bytes) -> Any:
+    """Parse a UTF-8 JSON response body."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _parse_instrument(item: Dict[str, Any]) -> Optional[Union[BondData, SwapData]]:
+    """Convert a Security Master instrument record to pricing data."""
+    if item["instrument_type"] == "BOND":
+        return BondData(
+            id=item["id"],
+            isin=item["isin"],
+            notional=float(item["notional"]),
+            coupon_rate=float(item["coupon_rate"]),
+            maturity_date=parse_date(item["maturity_date"]),
+            issue_date=parse_date(item.get("issue_date")),
+            payment_frequency=item.get("payment_frequency", "SEMI_ANNUAL"),
+            day_count_convention=item.get("day_count_convention", "ACT_ACT"),
+        )
+
+    if item["instrument_type"] == "SWAP":
+        return SwapData(
+            id=item["id"],
+            notional=float(item["notional"]),
+            fixed_rate=float(item["fixed_rate"]),
+            tenor=item["tenor"],
+            trade_date=parse_date(item["trade_date"]),
+            maturity_date=parse_date(item["maturity_date"]),
+            effective_date=parse_date(item.get("effective_date")),
+            pay_receive=item["pay_receive"],
+            float_index=item.get("float_index", "SOFR"),
+            payment_frequency=item.get("payment_frequency", "QUARTERLY"),
+        )
+
+    return None
+
+
+def _fetch_page(client: httpx.Client, url: str, page: int, page_size: int) -> Dict[str, Any]:
+    """Fetch one page of instruments from the Security Master."""
+    response = client.get(f"{url}/api/v1/instruments?page={page}&page_size={page_size}")
+    response.raise_for_status()
+    return _loads(response.content)
+
+
+def load_portfolio(
+    security_master_url: str,
+    page_size: int = 100,
+    max_workers: int = 8,
+) -> List[Union[BondData, SwapData]]:
     """Load portfolio from Security Master API.
 
+    The first page is fetched on its own to learn the page count; the
+    remaining pages are then fetched concurrently.
+
     Args:
         security_master_url: Base URL of Security Master service
+        page_size: Instruments requested per page
+        max_workers: Maximum concurrent page requests
 
     Returns:
         List of BondData and SwapData objects
@@ -31,66 +92,30 @@ def load_portfolio(security_master_url: str) -> List[Union[BondData, SwapData]]:
 
     try:
         with httpx.Client(timeout=30.0) as client:
-            # Fetch all instruments with pagination
-            page = 1
-            page_size = 100
-            total_loaded = 0
+            first = _fetch_page(client, security_master_url, 1, page_size)
+            logger.info(f"Total instruments in Security Master: {first['total']}")
 
-            while True:
-                response = client.get(
-                    f"{security_master_url}/api/v1/instruments?page={page}&page_size={page_size}"
-                )
-                response.raise_for_status()
+            pages = [first]
+            if first["pages"] > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    pages.extend(pool.map(
+                        lambda page: _fetch_page(client, security_master_url, page, page_size),
+                        range(2, first["pages"] + 1),
+                    ))
 
-                data = response.json()
-                if page == 1:
-                    logger.info(f"Total instruments in Security Master: {data['total']}")
-
-                if not data["items"]:
-                    break
-
-                total_loaded += len(data["items"])
-                logger.info(f"Loading page {page}/{data['pages']} ({total_loaded}/{data['total']} instruments)")
+            for page, data in enumerate(pages, 1):
+                logger.info(f"Loading page {page}/{first['pages']} ({len(data['items'])} instruments)")
 
                 for item in data["items"]:
                     try:
-                        if item["instrument_type"] == "BOND":
-                            bond = BondData(
-                                id=item["id"],
-                                isin=item["isin"],
-                                notional=float(item["notional"]),
-                                coupon_rate=float(item["coupon_rate"]),
-                                maturity_date=parse_date(item["maturity_date"]),
-                                issue_date=parse_date(item.get("issue_date")),
-                                payment_frequency=item.get("payment_frequency", "SEMI_ANNUAL"),
-                                day_count_convention=item.get("day_count_convention", "ACT_ACT"),
-                            )
-                            instruments.append(bond)
-
-                        elif item["instrument_type"] == "SWAP":
-                            swap = SwapData(
-                                id=item["id"],
-                                notional=float(item["notional"]),
-                                fixed_rate=float(item["fixed_rate"]),
-                                tenor=item["tenor"],
-                                trade_date=parse_date(item["trade_date"]),
-                                maturity_date=parse_date(item["maturity_date"]),
-                                effective_date=parse_date(item.get("effective_date")),
-                                pay_receive=item["pay_receive"],
-                                float_index=item.get("float_index", "SOFR"),
-                                payment_frequency=item.get("payment_frequency", "QUARTERLY"),
-                            )
-                            instruments.append(swap)
+                        instrument = _parse_instrument(item)
+                        if instrument is not None:
+                            instruments.append(instrument)
 
                     except Exception as e:
                         logger.error(f"Failed to parse instrument {item.get('id')}: {e}")
                         continue
 
-                # Check if we've loaded all pages
-                if page >= data["pages"]:
-                    break
-                page += 1
-
     except httpx.HTTPError as e:
         logger.error(f"Failed to load portfolio from Security Master: {e}")
         raise
@@ -7,7 +7,7 @@ Implements dual-curve framework:
 
 import logging
 from datetime import date
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import QuantLib as ql
 
@@ -40,11 +40,15 @@ class YieldCurveBuilder:
         self._quotes: Dict[str, ql.SimpleQuote] = {}
         self._curve: Optional[ql.YieldTermStructureHandle] = None
         self._curve_date: Optional[date] = None
+        self._curve_date_str: Optional[str] = None
 
         # Initialize quotes with zero values
         for tenor in self.TENORS:
             self._quotes[tenor] = ql.SimpleQuote(0.0)
 
+        # Fixed (quote, tenor) pairs walked on every update
+        self._quote_pairs = tuple((self._quotes[t], t) for t in self.TENORS)
+
     def update_rates(self, rates: Dict[str, float], curve_date: str) -> None:
         """Update quote values from market data.
 
@@ -52,19 +56,23 @@ class YieldCurveBuilder:
             rates: Dict mapping tenor strings to rate values
             curve_date: Date string in YYYY-MM-DD format
         """
-        for tenor, rate in rates.items():
-            if tenor in self._quotes:
-                self._quotes[tenor].setValue(rate)
-
-        # Parse and set evaluation date
-        year, month, day = map(int, curve_date.split("-"))
-        eval_date = ql.Date(day, month, year)
-        ql.Settings.instance().evaluationDate = eval_date
-        self._curve_date = date(year, month, day)
-
-        # Build curve if not already built
-        if self._curve is None:
-            self._build_curve(eval_date)
+        # Only touch quotes whose value moved to avoid needless curve notifications
+        for quote, tenor in self._quote_pairs:
+            rate = rates.get(tenor)
+            if rate is not None and quote.value() != rate:
+                quote.setValue(rate)
+
+        # Parse and set evaluation date only when the curve date changes
+        if curve_date != self._curve_date_str:
+            year, month, day = map(int, curve_date.split("-"))
+            eval_date = ql.Date(day, month, year)
+            ql.Settings.instance().evaluationDate = eval_date
+            self._curve_date = date(year, month, day)
+            self._curve_date_str = curve_date
+
+            # Build curve if not already built
+            if self._curve is None:
+                self._build_curve(eval_date)
 
         logger.debug(f"Updated rates for {curve_date}: {len(rates)} tenors")
 
@@ -125,6 +133,11 @@ class YieldCurveBuilder:
         """Get the yield curve handle for pricing."""
         return self._curve
 
+    @property
+    def curve_date(self) -> Optional[date]:
+        """Get the date the curve is currently built for."""
+        return self._curve_date
+
     @property
     def discount_curve(self) -> Optional[ql.YieldTermStructureHandle]:
         """Get the discount curve (same as forecasting for SOFR)."""
@@ -135,6 +148,15 @@ class YieldCurveBuilder:
         """Get the forecast curve."""
         return self._curve
 
+    def snapshot(self) -> Tuple[Dict[str, float], Optional[str]]:
+        """Get current quote values and curve date, enough to rebuild the curve elsewhere."""
+        return {tenor: quote.value() for quote, tenor in self._quote_pairs}, self._curve_date_str
+
+    @property
+    def quotes(self) -> Tuple[ql.SimpleQuote, ...]:
+        """Get every pillar quote in tenor order (for parallel bumping)."""
+        return tuple(quote for quote, _ in self._quote_pairs)
+
     def get_quote(self, tenor: str) -> Optional[ql.SimpleQuote]:
         """Get the quote object for a tenor (for bumping)."""
         return self._quotes.get(tenor)
@@ -1,17 +1,19 @@
 """Instrument pricing with QuantLib."""
 
 import logging
+from bisect import bisect_right
+from functools import lru_cache
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional, Sequence
 
 import QuantLib as ql
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BondData:
     """Bond instrument data."""
     id: str
@@ -24,7 +26,7 @@ class BondData:
     day_count_convention: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SwapData:
     """Swap instrument data."""
     id: str
@@ -39,26 +41,49 @@ class SwapData:
     payment_frequency: str
 
 
+# QuantLib conventions are built once at import and shared by all pricings
+_FREQ_MAP = {
+    "ANNUAL": ql.Annual,
+    "SEMI_ANNUAL": ql.Semiannual,
+    "QUARTERLY": ql.Quarterly,
+    "MONTHLY": ql.Monthly,
+}
+
+_DC_MAP = {
+    "ACT_ACT": ql.ActualActual(ql.ActualActual.Bond),
+    "ACT_360": ql.Actual360(),
+    "ACT_365": ql.Actual365Fixed(),
+    "30_360": ql.Thirty360(ql.Thirty360.BondBasis),
+}
+
+_US_CAL = ql.UnitedStates(ql.UnitedStates.GovernmentBond)
+
+_ACT360 = ql.Actual360()
+
+
 def parse_frequency(freq_str: str) -> int:
     """Convert frequency string to QuantLib frequency."""
-    freq_map = {
-        "ANNUAL": ql.Annual,
-        "SEMI_ANNUAL": ql.Semiannual,
-        "QUARTERLY": ql.Quarterly,
-        "MONTHLY": ql.Monthly,
-    }
-    return freq_map.get(freq_str, ql.Semiannual)
+    return _FREQ_MAP.get(freq_str, ql.Semiannual)
 
 
 def parse_day_count(dc_str: str):
     """Convert day count string to QuantLib day counter."""
-    dc_map = {
-        "ACT_ACT": ql.ActualActual(ql.ActualActual.Bond),
-        "ACT_360": ql.Actual360(),
-        "ACT_365": ql.Actual365Fixed(),
-        "30_360": ql.Thirty360(ql.Thirty360.BondBasis),
-    }
-    return dc_map.get(dc_str, ql.ActualActual(ql.ActualActual.Bond))
+    return _DC_MAP.get(dc_str, _DC_MAP["ACT_ACT"])
+
+
+@lru_cache(maxsize=4096)
+def _swap_schedule(effective_serial: int, maturity_serial: int, frequency: int) -> ql.Schedule:
+    """Build (and memoize) a modified-following swap leg schedule."""
+    return ql.Schedule(
+        ql.Date(effective_serial),
+        ql.Date(maturity_serial),
+        ql.Period(frequency),
+        _US_CAL,
+        ql.ModifiedFollowing,
+        ql.ModifiedFollowing,
+        ql.DateGeneration.Forward,
+        False
+    )
 
 
 def to_ql_date(d: date):
@@ -72,7 +97,51 @@ class BondPricer:
     def __init__(self, discount_curve: ql.YieldTermStructureHandle):
         """Initialize with discount curve."""
         self.discount_curve = discount_curve
-        self.calendar = ql.UnitedStates(ql.UnitedStates.GovernmentBond)
+        self.calendar = _US_CAL
+
+        # One engine serves every bond; pricers are not shared across threads
+        self.engine = ql.DiscountingBondEngine(discount_curve)
+
+    def build(self, bond: BondData) -> ql.FixedRateBond:
+        """Build a QuantLib bond priced off the discount curve.
+
+        Args:
+            bond: Bond instrument data
+
+        Returns:
+            FixedRateBond with a discounting engine attached
+        """
+        # Set up bond schedule
+        maturity = to_ql_date(bond.maturity_date)
+        issue = to_ql_date(bond.issue_date) if bond.issue_date else maturity - ql.Period(5, ql.Years)
+
+        frequency = parse_frequency(bond.payment_frequency)
+        day_count = parse_day_count(bond.day_count_convention)
+
+        schedule = ql.Schedule(
+            issue,
+            maturity,
+            ql.Period(frequency),
+            self.calendar,
+            ql.Unadjusted,
+            ql.Unadjusted,
+            ql.DateGeneration.Backward,
+            False
+        )
+
+        # Create fixed rate bond
+        ql_bond = ql.FixedRateBond(
+            2,  # settlement days
+            bond.notional,
+            schedule,
+            [bond.coupon_rate],
+            day_count
+        )
+
+        # Set up pricing engine
+        ql_bond.setPricingEngine(self.engine)
+
+        return ql_bond
 
     def price(self, bond: BondData) -> float:
         """Calculate bond NPV.
@@ -84,42 +153,83 @@ class BondPricer:
             Net present value in currency units
         """
         try:
-            # Set up bond schedule
-            maturity = to_ql_date(bond.maturity_date)
-            issue = to_ql_date(bond.issue_date) if bond.issue_date else maturity - ql.Period(5, ql.Years)
-
-            frequency = parse_frequency(bond.payment_frequency)
-            day_count = parse_day_count(bond.day_count_convention)
-
-            schedule = ql.Schedule(
-                issue,
-                maturity,
-                ql.Period(frequency),
-                self.calendar,
-                ql.Unadjusted,
-                ql.Unadjusted,
-                ql.DateGeneration.Backward,
-                False
-            )
+            return self.build(bond).NPV()
 
-            # Create fixed rate bond
-            ql_bond = ql.FixedRateBond(
-                2,  # settlement days
-                bond.notional,
-                schedule,
-                [bond.coupon_rate],
-                day_count
-            )
+        except Exception as e:
+            logger.error("Error pricing bond %s: %s", bond.id, e)
+            raise
 
-            # Set up pricing engine
-            engine = ql.DiscountingBondEngine(self.discount_curve)
-            ql_bond.setPricingEngine(engine)
+    def dv01(self, ql_bond: ql.FixedRateBond, bump_size: float = 0.0001) -> float:
+        """Calculate DV01 analytically from the bond's fixed cashflows.
 
-            return ql_bond.NPV()
+        Sums cashflow * time * discount factor over the remaining cashflows,
+        i.e. the NPV change for a parallel shift of continuously-compounded
+        zero rates, without repricing or rebootstrapping the curve.
 
-        except Exception as e:
-            logger.error(f"Error pricing bond {bond.id}: {e}")
-            raise
+        Args:
+            ql_bond: Bond returned by build()
+            bump_size: Size of rate shift in decimal (0.0001 = 1bp)
+
+        Returns:
+            Positive value when the bond loses money as rates rise
+        """
+        curve = self.discount_curve
+        settlement = ql_bond.settlementDate()
+
+        sensitivity = 0.0
+        for cashflow in ql_bond.cashflows():
+            if cashflow.hasOccurred(settlement):
+                continue
+            pay_date = cashflow.date()
+            sensitivity += cashflow.amount() * curve.timeFromReference(pay_date) * curve.discount(pay_date)
+
+        return sensitivity * bump_size
+
+    def key_rate_dv01s(
+        self,
+        ql_bond: ql.FixedRateBond,
+        key_years: Sequence[float],
+        bump_size: float = 0.0001,
+    ) -> List[float]:
+        """Calculate key rate DV01s analytically from the bond's fixed cashflows.
+
+        Each cashflow's zero-rate sensitivity is split between the two
+        surrounding key tenors with triangular (linear) weights, flat beyond
+        the first and last key. The weights sum to one, so the results add
+        up to dv01().
+
+        Args:
+            ql_bond: Bond returned by build()
+            key_years: Ascending key tenors in years
+            bump_size: Size of rate shift in decimal (0.0001 = 1bp)
+
+        Returns:
+            One value per key tenor, positive when the bond loses as rates rise
+        """
+        curve = self.discount_curve
+        settlement = ql_bond.settlementDate()
+        last = len(key_years) - 1
+        buckets = [0.0] * len(key_years)
+
+        for cashflow in ql_bond.cashflows():
+            if cashflow.hasOccurred(settlement):
+                continue
+            pay_date = cashflow.date()
+            t = curve.timeFromReference(pay_date)
+            sensitivity = cashflow.amount() * t * curve.discount(pay_date)
+
+            if t <= key_years[0]:
+                buckets[0] += sensitivity
+            elif t >= key_years[last]:
+                buckets[last] += sensitivity
+            else:
+                upper = bisect_right(key_years, t)
+                lower_year, upper_year = key_years[upper - 1], key_years[upper]
+                weight = (t - lower_year) / (upper_year - lower_year)
+                buckets[upper - 1] += sensitivity * (1.0 - weight)
+                buckets[upper] += sensitivity * weight
+
+        return [bucket * bump_size for bucket in buckets]
 
 
 class SwapPricer:
@@ -133,74 +243,71 @@ class SwapPricer:
         """Initialize with discount and forecast curves."""
         self.discount_curve = discount_curve
         self.forecast_curve = forecast_curve
-        self.calendar = ql.UnitedStates(ql.UnitedStates.GovernmentBond)
+        self.calendar = _US_CAL
 
-    def price(self, swap: SwapData) -> float:
-        """Calculate swap NPV.
+        # SOFR index and engine shared by every swap priced here
+        self.sofr_index = ql.Sofr(forecast_curve)
+        self.engine = ql.DiscountingSwapEngine(discount_curve)
+
+    def build(self, swap: SwapData) -> ql.VanillaSwap:
+        """Build a QuantLib swap priced off the discount and forecast curves.
 
         Args:
             swap: Swap instrument data
 
         Returns:
-            Net present value in currency units
+            VanillaSwap with a discounting engine attached
         """
-        try:
-            # Determine swap type
-            swap_type = ql.Swap.Payer if swap.pay_receive == "PAY" else ql.Swap.Receiver
-
-            # Set dates
-            effective = to_ql_date(swap.effective_date) if swap.effective_date else to_ql_date(swap.trade_date) + 2
-            maturity = to_ql_date(swap.maturity_date)
-
-            # Create SOFR index linked to forecast curve
-            sofr_index = ql.Sofr(self.forecast_curve)
-
-            # Fixed leg parameters
-            fixed_frequency = parse_frequency(swap.payment_frequency)
-            fixed_day_count = ql.Actual360()
-
-            # Create vanilla swap
-            fixed_schedule = ql.Schedule(
-                effective,
-                maturity,
-                ql.Period(fixed_frequency),
-                self.calendar,
-                ql.ModifiedFollowing,
-                ql.ModifiedFollowing,
-                ql.DateGeneration.Forward,
-                False
-            )
+        # Determine swap type
+        swap_type = ql.Swap.Payer if swap.pay_receive == "PAY" else ql.Swap.Receiver
 
-            float_schedule = ql.Schedule(
-                effective,
-                maturity,
-                ql.Period(ql.Quarterly),  # SOFR typically quarterly
-                self.calendar,
-                ql.ModifiedFollowing,
-                ql.ModifiedFollowing,
-                ql.DateGeneration.Forward,
-                False
-            )
+        # Set dates
+        effective = to_ql_date(swap.effective_date) if swap.effective_date else to_ql_date(swap.trade_date) + 2
+        maturity = to_ql_date(swap.maturity_date)
 
-            # Create the swap
-            ql_swap = ql.VanillaSwap(
-                swap_type,
-                swap.notional,
-                fixed_schedule,
-                swap.fixed_rate,
-                fixed_day_count,
-                float_schedule,
-                sofr_index,
-                0.0,  # spread
-                ql.Actual360()
+        # Fixed leg parameters
+        fixed_frequency = parse_frequency(swap.payment_frequency)
+
+        # Create vanilla swap
+        fixed_schedule = _swap_schedule(effective.serialNumber(), maturity.serialNumber(), fixed_frequency)
+
+        if fixed_frequency == ql.Quarterly:
+            float_schedule = fixed_schedule
+        else:
+            float_schedule = _swap_schedule(
+                effective.serialNumber(), maturity.serialNumber(), ql.Quarterly  # SOFR typically quarterly
             )
 
-            # Set up pricing engine
-            engine = ql.DiscountingSwapEngine(self.discount_curve)
-            ql_swap.setPricingEngine(engine)
+        # Create the swap
+        ql_swap = ql.VanillaSwap(
+            swap_type,
+            swap.notional,
+            fixed_schedule,
+            swap.fixed_rate,
+            _ACT360,
+            float_schedule,
+            self.sofr_index,
+            0.0,  # spread
+            _ACT360
+        )
+
+        # Set up pricing engine
+        ql_swap.setPricingEngine(self.engine)
+
+        return ql_swap
+
+    def price(self, swap: SwapData) -> float:
+        """Calculate swap NPV.
+
+        Args:
+            swap: Swap instrument data
 
-            return ql_swap.NPV()
+        Returns:
+            Net present value in currency units
+        """
+        try:
+            return self.build(swap).NPV()
 
         except Exception as e:
-            logger.error(f"Error pricing swap {swap.id}: {e}")
+            logger.error("Error pricing swap %s: %s", swap.id, e)
             raise
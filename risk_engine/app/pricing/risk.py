@@ -1,16 +1,49 @@
 """Risk calculations using bump-and-reprice method."""
 
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import QuantLib as ql
 
 from .curves import YieldCurveBuilder
 from .instruments import BondData, SwapData, BondPricer, SwapPricer
 
 logger = logging.getLogger(__name__)
 
+# Instrument type -> pricer factory taking the SOFR curve handle
+_PRICER_REGISTRY: Dict[type, Callable[[ql.YieldTermStructureHandle], Any]] = {
+    BondData: BondPricer,
+    SwapData: lambda curve: SwapPricer(curve, curve),  # Same curve for discount/forecast
+}
+
+# Calculator owned by each pool worker process, created by _init_worker
+_worker_calculator: Optional["RiskCalculator"] = None
+
+
+def _init_worker(bump_size: float, analytic_dv01: bool, analytic_krd: bool) -> None:
+    """Create the worker's own curve builder and calculator."""
+    global _worker_calculator
+    _worker_calculator = RiskCalculator(
+        YieldCurveBuilder(), bump_size, analytic_dv01, analytic_krd
+    )
+
 
-@dataclass
+def _calculate_chunk(
+    rates: Dict[str, float],
+    curve_date: str,
+    instruments: List[Union[BondData, SwapData]],
+) -> List["RiskMetrics"]:
+    """Price a chunk of instruments in a worker against the given curve."""
+    _worker_calculator.curve_builder.update_rates(rates, curve_date)
+    return _worker_calculator.calculate_batch(instruments)
+
+
+@dataclass(slots=True)
 class RiskMetrics:
     """Risk metrics for an instrument."""
     instrument_id: str
@@ -24,16 +57,56 @@ class RiskCalculator:
 
     # Key rate tenors for KRD calculation
     KRD_TENORS = ["2Y", "5Y", "10Y", "30Y"]
+    KRD_TENOR_YEARS = [2, 5, 10, 30]
 
-    def __init__(self, curve_builder: YieldCurveBuilder, bump_size: float = 0.0001):
+    def __init__(
+        self,
+        curve_builder: YieldCurveBuilder,
+        bump_size: float = 0.0001,
+        analytic_dv01: bool = False,
+        analytic_krd: bool = False,
+        workers: int = 1,
+    ):
         """Initialize risk calculator.
 
         Args:
             curve_builder: Yield curve builder with mutable quotes
             bump_size: Size of rate bump in decimal (0.0001 = 1bp)
+            analytic_dv01: Compute bond DV01 from cashflows as a parallel
+                zero-rate shift instead of bumping par quotes. Faster, but a
+                different DV01 definition from swaps and the bumped KRDs, so
+                bond KRDs no longer sum to it
+            analytic_krd: Compute bond KRD from cashflows as triangular
+                zero-rate key rate shifts instead of bumping curve pillars
+            workers: Worker processes for calculate_batch; 1 prices in-process,
+                0 uses one per CPU
         """
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+
         self.curve_builder = curve_builder
         self.bump_size = bump_size
+        self.analytic_dv01 = analytic_dv01
+        self.analytic_krd = analytic_krd
+        self.workers = workers
+
+        # Pricers by instrument type, created once the curve exists
+        self._pricers: Dict[type, Any] = {}
+
+        # Quote objects live as long as the builder, so bind them once
+        self._all_quotes = curve_builder.quotes
+        self._krd_quotes = [curve_builder.get_quote(tenor) for tenor in self.KRD_TENORS]
+
+        # QuantLib objects can't be pickled, so each worker rebuilds the curve
+        # from the quote values. Spawn avoids forking the consumer's threads.
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(bump_size, analytic_dv01, analytic_krd),
+            )
 
     def calculate(
         self,
@@ -47,14 +120,33 @@ class RiskCalculator:
         Returns:
             RiskMetrics with NPV, DV01, and KRD
         """
+        pricer = self._pricer_for(type(instrument))
+
+        # Build once; bumping quotes re-prices it through QuantLib's observers
+        ql_instrument = pricer.build(instrument)
+
         # Get base NPV
-        base_npv = self._price_instrument(instrument)
+        base_npv = ql_instrument.NPV()
+
+        is_bond = type(instrument) is BondData
 
-        # Calculate DV01 (parallel shift)
-        dv01 = self._calculate_dv01(instrument, base_npv)
+        if is_bond and self.analytic_krd:
+            # One cashflow pass gives every key rate; they sum to the DV01
+            values = pricer.key_rate_dv01s(
+                ql_instrument, self.KRD_TENOR_YEARS, self.bump_size
+            )
+            krd = dict(zip(self.KRD_TENORS, values))
+            dv01 = sum(values)
+        else:
+            if is_bond and self.analytic_dv01:
+                # Bond cashflows are fixed, so DV01 needs no repricing
+                dv01 = pricer.dv01(ql_instrument, self.bump_size)
+            else:
+                # Calculate DV01 (parallel shift)
+                dv01 = self._calculate_dv01(ql_instrument, base_npv)
 
-        # Calculate KRD (key rate durations)
-        krd = self._calculate_krd(instrument, base_npv)
+            # Calculate KRD (key rate durations)
+            krd = self._calculate_krd(ql_instrument, base_npv, instrument.maturity_date)
 
         return RiskMetrics(
             instrument_id=instrument.id,
@@ -63,22 +155,80 @@ class RiskCalculator:
             krd=krd
         )
 
-    def _price_instrument(self, instrument: Union[BondData, SwapData]) -> float:
-        """Price an instrument using current curves."""
+    def calculate_batch(
+        self,
+        instruments: List[Union[BondData, SwapData]]
+    ) -> List[RiskMetrics]:
+        """Calculate risk metrics for many instruments against the current curve.
+
+        Instruments that fail to price are logged and skipped. With more
+        than one worker the portfolio is split into chunks priced in
+        parallel processes; results keep the input order.
+
+        Args:
+            instruments: Bonds and swaps to price
+
+        Returns:
+            RiskMetrics for each instrument that priced successfully
+        """
+        if self._pool is not None and len(instruments) >= 2 * self.workers:
+            rates, curve_date = self.curve_builder.snapshot()
+            chunk_size = max(1, len(instruments) // (4 * self.workers))
+            chunks = [
+                instruments[i:i + chunk_size]
+                for i in range(0, len(instruments), chunk_size)
+            ]
+
+            results = []
+            for chunk_results in self._pool.map(
+                _calculate_chunk,
+                [rates] * len(chunks),
+                [curve_date] * len(chunks),
+                chunks,
+            ):
+                results.extend(chunk_results)
+            return results
+
+        results = []
+        append = results.append
+        calculate = self.calculate
+
+        for instrument in instruments:
+            try:
+                append(calculate(instrument))
+
+            except Exception as e:
+                logger.error("Failed to calculate risk for %s: %s", instrument.id, e)
+                continue
+
+        return results
+
+    def close(self) -> None:
+        """Shut down the worker pool, if any."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _pricer_for(self, instrument_type: type) -> Any:
+        """Get the pricer for an instrument type, creating it on first use."""
+        pricer = self._pricers.get(instrument_type)
+        if pricer is not None:
+            return pricer
+
+        factory = _PRICER_REGISTRY.get(instrument_type)
+        if factory is None:
+            raise ValueError(f"Unsupported instrument type: {instrument_type.__name__}")
+
         curve = self.curve_builder.curve_handle
         if curve is None:
             raise ValueError("Yield curve not built")
 
-        if isinstance(instrument, BondData):
-            pricer = BondPricer(curve)
-            return pricer.price(instrument)
-        else:
-            pricer = SwapPricer(curve, curve)  # Same curve for discount/forecast
-            return pricer.price(instrument)
+        pricer = self._pricers[instrument_type] = factory(curve)
+        return pricer
 
     def _calculate_dv01(
         self,
-        instrument: Union[BondData, SwapData],
+        ql_instrument: ql.Instrument,
         base_npv: float
     ) -> float:
         """Calculate DV01 via parallel curve shift.
@@ -88,26 +238,20 @@ class RiskCalculator:
         Uses central difference for better accuracy.
         """
         # Store original values
-        original_values = {}
-        for tenor in YieldCurveBuilder.TENORS:
-            quote = self.curve_builder.get_quote(tenor)
-            if quote is not None:
-                original_values[tenor] = quote.value()
+        originals = [(quote, quote.value()) for quote in self._all_quotes]
 
         try:
-            # Bump up all tenors
-            for tenor, orig_value in original_values.items():
-                quote = self.curve_builder.get_quote(tenor)
-                quote.setValue(orig_value + self.bump_size)
-
-            npv_up = self._price_instrument(instrument)
-
             # Bump down all tenors
-            for tenor, orig_value in original_values.items():
-                quote = self.curve_builder.get_quote(tenor)
+            for quote, orig_value in originals:
                 quote.setValue(orig_value - self.bump_size)
 
-            npv_down = self._price_instrument(instrument)
+            npv_down = ql_instrument.NPV()
+
+            # Bump up all tenors
+            for quote, orig_value in originals:
+                quote.setValue(orig_value + self.bump_size)
+
+            npv_up = ql_instrument.NPV()
 
             # DV01 = (NPV_down - NPV_up) / 2
             # Positive DV01 means lose money when rates rise
@@ -117,25 +261,28 @@ class RiskCalculator:
 
         finally:
             # Restore original values
-            for tenor, orig_value in original_values.items():
-                quote = self.curve_builder.get_quote(tenor)
+            for quote, orig_value in originals:
                 quote.setValue(orig_value)
 
     def _calculate_krd(
         self,
-        instrument: Union[BondData, SwapData],
-        base_npv: float
+        ql_instrument: ql.Instrument,
+        base_npv: float,
+        maturity: Optional[date] = None
     ) -> Dict[str, float]:
         """Calculate Key Rate Durations.
 
         Bumps each key rate tenor individually to measure
-        sensitivity to specific parts of the curve.
+        sensitivity to specific parts of the curve. Uses a one-sided
+        difference against base_npv, so each tenor costs one repricing.
+        Tenors two or more key tenors beyond the instrument's maturity
+        are left at zero without pricing.
         """
         krd = {}
+        years = self._years_to(maturity)
 
-        for tenor in self.KRD_TENORS:
-            quote = self.curve_builder.get_quote(tenor)
-            if quote is None:
+        for i, (tenor, quote) in enumerate(zip(self.KRD_TENORS, self._krd_quotes)):
+            if quote is None or (i >= 2 and years <= self.KRD_TENOR_YEARS[i - 2]):
                 krd[tenor] = 0.0
                 continue
 
@@ -144,17 +291,20 @@ class RiskCalculator:
             try:
                 # Bump up
                 quote.setValue(original_value + self.bump_size)
-                npv_up = self._price_instrument(instrument)
-
-                # Bump down
-                quote.setValue(original_value - self.bump_size)
-                npv_down = self._price_instrument(instrument)
+                npv_up = ql_instrument.NPV()
 
                 # KRD for this tenor
-                krd[tenor] = (npv_down - npv_up) / 2
+                krd[tenor] = base_npv - npv_up
 
             finally:
                 # Restore
                 quote.setValue(original_value)
 
         return krd
+
+    def _years_to(self, maturity: Optional[date]) -> float:
+        """Years from the curve date to maturity; infinite if unknown."""
+        curve_date = self.curve_builder.curve_date
+        if maturity is None or curve_date is None:
+            return float("inf")
+        return (maturity - curve_date).days / 365.25
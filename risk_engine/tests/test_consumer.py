@@ -0,0 +1,80 @@
+"""Tests for the market data Kafka consumer."""
+
+from unittest.mock import MagicMock, patch
+
+from app.consumer.kafka_consumer import MarketDataConsumer
+
+
+# A minimal valid curve update
+CURVE_UPDATE = b'{"timestamp": "t", "curve_date": "2026-01-28", "rates": {}}'
+
+
+def _message(offset: int, value: bytes = CURVE_UPDATE) -> MagicMock:
+    """Build a mock Kafka message, by default carrying a minimal curve update."""
+    msg = MagicMock()
+    msg.error.return_value = None
+    msg.offset.return_value = offset
+    msg.value.return_value = value
+    return msg
+
+
+class TestMarketDataConsumer:
+    """Tests for offset handling in MarketDataConsumer."""
+
+    @patch("app.consumer.kafka_consumer.Consumer")
+    def test_disables_automatic_offset_store(self, mock_consumer_class):
+        """Test that fetched messages are not stored until processed."""
+        MarketDataConsumer("localhost:9092", "group", "topic")
+
+        config = mock_consumer_class.call_args[0][0]
+        assert config["enable.auto.offset.store"] is False
+
+    @patch("app.consumer.kafka_consumer.COMMIT_INTERVAL_SECONDS", 0.0)
+    @patch("app.consumer.kafka_consumer.Consumer")
+    def test_unprocessed_tail_is_not_stored(self, mock_consumer_class):
+        """Test that a mid-batch commit and close cover only processed messages."""
+        kafka = mock_consumer_class.return_value
+        batch = [_message(offset) for offset in range(5)]
+        kafka.consume.side_effect = [batch[:1], batch[1:]]
+
+        consumer = MarketDataConsumer("localhost:9092", "group", "topic")
+        messages = consumer.consume(batch_size=5)
+        next(messages)
+        next(messages)  # Resuming marks the first message processed
+        messages.close()  # Stop mid-batch, as on shutdown
+        consumer.close()
+
+        stored = [call.kwargs["message"] for call in kafka.store_offsets.call_args_list]
+        assert stored == batch[:1]
+        kafka.commit.assert_called_with(asynchronous=True)
+
+    @patch("app.consumer.kafka_consumer.Consumer")
+    def test_malformed_messages_are_skipped(self, mock_consumer_class):
+        """Test that malformed payloads are stored and skipped instead of raising."""
+        kafka = mock_consumer_class.return_value
+        batch = [
+            _message(0, b"not json"),
+            _message(1, b"123"),
+            _message(2, b'{"r": [0.04]}'),  # Compact message missing t/d/c
+            _message(3),
+        ]
+        kafka.consume.side_effect = [batch[:1], batch[1:]]
+
+        consumer = MarketDataConsumer("localhost:9092", "group", "topic")
+        messages = consumer.consume(batch_size=4)
+        assert next(messages)["curve_date"] == "2026-01-28"
+
+        stored = [call.kwargs["message"] for call in kafka.store_offsets.call_args_list]
+        assert stored == batch[:3]
+
+    @patch("app.consumer.kafka_consumer.Consumer")
+    def test_blocks_only_for_first_message(self, mock_consumer_class):
+        """Test that a batch waits for one message and drains the rest without blocking."""
+        kafka = mock_consumer_class.return_value
+        kafka.consume.side_effect = [[_message(0)], [_message(1)]]
+
+        consumer = MarketDataConsumer("localhost:9092", "group", "topic")
+        next(consumer.consume(timeout=1.0, batch_size=100))
+
+        assert kafka.consume.call_args_list[0].kwargs == {"num_messages": 1, "timeout": 1.0}
+        assert kafka.consume.call_args_list[1].kwargs == {"num_messages": 99, "timeout": 0}
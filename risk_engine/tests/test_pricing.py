@@ -73,6 +73,22 @@ class TestYieldCurveBuilder:
         df_5y = builder.get_discount_factor(5.0)
         assert df_5y < df_1y
 
+    def test_update_rates_same_date_keeps_curve(self):
+        """Test repeated updates on one date only move the quotes."""
+        builder = YieldCurveBuilder()
+
+        builder.update_rates({"2Y": 0.0420, "5Y": 0.0410}, "2026-01-28")
+        curve = builder.curve_handle
+
+        builder.update_rates({"2Y": 0.0430, "5Y": 0.0410}, "2026-01-28")
+
+        assert builder.curve_handle is curve
+        assert builder.get_quote("2Y").value() == 0.0430
+
+        builder.update_rates({"2Y": 0.0430}, "2026-01-29")
+
+        assert builder._curve_date == date(2026, 1, 29)
+
 
 class TestBondPricer:
     """Tests for bond pricing."""
@@ -205,6 +221,43 @@ class TestRiskCalculator:
         # Roughly $100-500 per bp for a 2-3 year bond
         assert 50 < metrics.dv01 < 1000
 
+    def test_default_dv01_is_bump_and_reprice(self, risk_setup):
+        """Test the default bond DV01 is the bumped-par-curve value used for swaps and KRD."""
+        calculator, bond = risk_setup
+
+        metrics = calculator.calculate(bond)
+
+        pricer = calculator._pricer_for(BondData)
+        ql_bond = pricer.build(bond)
+        assert metrics.dv01 == pytest.approx(
+            calculator._calculate_dv01(ql_bond, ql_bond.NPV()), rel=1e-12
+        )
+
+    def test_analytic_dv01_matches_bump_and_reprice(self, risk_setup):
+        """Test analytic bond DV01 agrees with the bumped-curve DV01."""
+        calculator, bond = risk_setup
+        analytic_calculator = RiskCalculator(calculator.curve_builder, analytic_dv01=True)
+
+        analytic = analytic_calculator.calculate(bond)
+        reference = calculator.calculate(bond)
+
+        assert analytic.npv == pytest.approx(reference.npv)
+        assert analytic.dv01 == pytest.approx(reference.dv01, rel=0.05)
+
+    def test_analytic_krd_sums_to_dv01(self, risk_setup):
+        """Test analytic bond KRDs add up to the analytic DV01."""
+        calculator, bond = risk_setup
+        analytic = RiskCalculator(calculator.curve_builder, analytic_krd=True)
+
+        metrics = analytic.calculate(bond)
+
+        assert sum(metrics.krd.values()) == pytest.approx(metrics.dv01)
+        analytic_dv01 = RiskCalculator(calculator.curve_builder, analytic_dv01=True)
+        assert metrics.dv01 == pytest.approx(analytic_dv01.calculate(bond).dv01)
+        # A bond maturing in under 3 years has no 10Y or 30Y exposure
+        assert metrics.krd["2Y"] > 0 and metrics.krd["5Y"] > 0
+        assert metrics.krd["10Y"] == 0.0 and metrics.krd["30Y"] == 0.0
+
     def test_calculate_krd(self, risk_setup):
         """Test KRD calculation."""
         calculator, bond = risk_setup
@@ -235,3 +288,39 @@ class TestRiskCalculator:
         assert isinstance(metrics.npv, float)
         assert isinstance(metrics.dv01, float)
         assert isinstance(metrics.krd, dict)
+
+    def test_calculate_batch_with_workers_matches_serial(self, risk_setup):
+        """Test process-pool batch pricing returns the serial results in order."""
+        calculator, bond = risk_setup
+        bonds = [
+            BondData(
+                id=f"bond-{years}",
+                isin=bond.isin,
+                notional=bond.notional,
+                coupon_rate=bond.coupon_rate,
+                maturity_date=date(2026 + years, 11, 15),
+                issue_date=bond.issue_date,
+                payment_frequency=bond.payment_frequency,
+                day_count_convention=bond.day_count_convention,
+            )
+            for years in range(1, 9)
+        ]
+        parallel = RiskCalculator(calculator.curve_builder, workers=2)
+
+        try:
+            results = parallel.calculate_batch(bonds)
+        finally:
+            parallel.close()
+
+        expected = calculator.calculate_batch(bonds)
+        assert [m.instrument_id for m in results] == [m.instrument_id for m in expected]
+        assert [m.dv01 for m in results] == pytest.approx([m.dv01 for m in expected])
+
+    def test_calculate_batch_skips_failures(self, risk_setup):
+        """Test batch calculation drops instruments that fail to price."""
+        calculator, bond = risk_setup
+        broken = MagicMock(id="broken")
+
+        results = calculator.calculate_batch([bond, broken])
+
+        assert [m.instrument_id for m in results] == ["test-bond"]
@@ -20,11 +20,17 @@ import argparse
 import json
 import csv
 import random
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from pathlib import Path
 import httpx
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
 
 # Portfolio definitions
 PORTFOLIO_STRATEGIES = [
@@ -121,6 +127,23 @@ PORTFOLIO_STRATEGIES = [
 ]
 
 
+PORTFOLIO_BY_ID = {p["id"]: p for p in PORTFOLIO_STRATEGIES}
+
+# Shared generator so a --seed makes the whole database reproducible
+rng = random.Random()
+
+# Coupon spread over the base rate by credit rating
+RATING_SPREADS = {
+    "AAA": -0.005, "AA+": 0.000, "AA": 0.002, "AA-": 0.005,
+    "A+": 0.008, "A": 0.010, "A-": 0.015, "BBB+": 0.020,
+    "BBB": 0.025, "BBB-": 0.030, "BB+": 0.040, "BB": 0.050,
+    "BB-": 0.060, "B+": 0.080,
+}
+
+# Maturities (years) drawn for generated bonds
+MATURITY_TENORS = (2, 3, 5, 7, 10, 15, 20, 30)
+
+
 # Real bond database - curated from major issuers
 # This would be replaced by FINRA data in production
 REAL_BOND_DATABASE = [
@@ -212,30 +235,34 @@ def generate_bond_isins(issuer_data: Dict, count: int) -> List[Dict]:
     """Generate realistic bond ISINs and characteristics for an issuer."""
     bonds = []
     base_year = 2020
+    rating_spread = RATING_SPREADS.get(issuer_data["rating"], 0.030)
+
+    # Draw each random attribute for the whole issuer in one call
+    tenors = rng.choices(MATURITY_TENORS, k=count)
+    issue_years = rng.choices(range(base_year, 2025), k=count)
+    issue_months = rng.choices(range(1, 13), k=count)
+    cusip_suffixes = rng.choices(range(10, 100), k=count)
+    frequencies = rng.choices(("SEMI_ANNUAL", "QUARTERLY"), k=count)
     
     for i in range(count):
         # Maturity between 1 and 30 years
-        years_to_maturity = random.choice([2, 3, 5, 7, 10, 15, 20, 30])
-        issue_year = random.randint(base_year, 2024)
+        years_to_maturity = tenors[i]
+        issue_year = issue_years[i]
         maturity_year = issue_year + years_to_maturity
         
         # Coupon based on maturity and rating
         base_coupon = 0.040  # 4.0% base
         maturity_spread = (years_to_maturity / 30) * 0.015  # Up to 1.5% for 30Y
-        rating_spread = {"AAA": -0.005, "AA+": 0.000, "AA": 0.002, "AA-": 0.005,
-                        "A+": 0.008, "A": 0.010, "A-": 0.015, "BBB+": 0.020,
-                        "BBB": 0.025, "BBB-": 0.030, "BB+": 0.040, "BB": 0.050,
-                        "BB-": 0.060, "B+": 0.080}.get(issuer_data["rating"], 0.030)
         
-        coupon = base_coupon + maturity_spread + rating_spread + random.uniform(-0.005, 0.005)
+        coupon = base_coupon + maturity_spread + rating_spread + rng.uniform(-0.005, 0.005)
         coupon = round(coupon, 5)
         
         # Generate CUSIP/ISIN
-        cusip = f"{issuer_data['cusip_prefix']}{chr(65+i%26)}{chr(65+(i//26)%26)}{random.randint(10,99)}"
+        cusip = f"{issuer_data['cusip_prefix']}{chr(65+i%26)}{chr(65+(i//26)%26)}{cusip_suffixes[i]}"
         isin = f"US{cusip}"
         
         # Issue and maturity dates
-        issue_month = random.randint(1, 12)
+        issue_month = issue_months[i]
         issue_day = 15 if issue_month != 2 else 1
         issue_date = f"{issue_year}-{issue_month:02d}-{issue_day:02d}"
         maturity_date = f"{maturity_year}-{issue_month:02d}-{issue_day:02d}"
@@ -250,7 +277,7 @@ def generate_bond_isins(issuer_data: Dict, count: int) -> List[Dict]:
             "coupon_rate": coupon,
             "issue_date": issue_date,
             "maturity_date": maturity_date,
-            "payment_frequency": random.choice(["SEMI_ANNUAL", "QUARTERLY"]),
+            "payment_frequency": frequencies[i],
             "day_count_convention": "30_360",
         })
     
@@ -258,46 +285,59 @@ def generate_bond_isins(issuer_data: Dict, count: int) -> List[Dict]:
 
 
 def assign_bonds_to_portfolios(all_bonds: List[Dict], portfolios: List[Dict]) -> Dict[str, List[Dict]]:
-    """Assign bonds to portfolios based on strategy. Each bond is assigned to exactly one portfolio."""
+    """Assign bonds to portfolios based on strategy. Each bond is assigned to exactly one portfolio.
+
+    Shuffles ``all_bonds`` and annotates the assigned bond dicts in place.
+    """
     portfolio_assignments = {p["id"]: [] for p in portfolios}
 
     # Track assigned ISINs to avoid duplicates
     assigned_isins = set()
 
-    # Create a pool of available bonds (each can only be used once)
-    available_bonds = all_bonds.copy()
-    random.shuffle(available_bonds)
+    # Shuffle once, then bucket by sector. Entries keep their shuffled position
+    # so picks across several sectors still come out in random order.
+    rng.shuffle(all_bonds)
+    by_sector: Dict[str, deque] = defaultdict(deque)
+    for position, bond in enumerate(all_bonds):
+        by_sector[bond["sector"]].append((position, bond))
+    fallback = deque(enumerate(all_bonds))
+
+    def take(queues: List[deque], count: int, selected: List[Dict]) -> None:
+        """Pop unassigned bonds in shuffled order until ``selected`` holds ``count``."""
+        while len(selected) < count:
+            live = []
+            for queue in queues:
+                while queue and queue[0][1]["isin"] in assigned_isins:
+                    queue.popleft()
+                if queue:
+                    live.append(queue)
+            if not live:
+                return
+            bond = min(live, key=lambda q: q[0][0]).popleft()[1]
+            assigned_isins.add(bond["isin"])
+            selected.append(bond)
 
     # Assign to portfolios
     for portfolio in portfolios:
         target_count = portfolio["target_bonds"]
         matching_sectors = portfolio["sectors"]
 
-        # Collect eligible bonds that haven't been assigned yet
-        eligible_bonds = [
-            b for b in available_bonds
-            if b["isin"] not in assigned_isins and (
-                "Various" in matching_sectors or
-                b["sector"] in matching_sectors
-            )
-        ]
+        selected = []
+        if "Various" in matching_sectors:
+            take([fallback], target_count, selected)
+        else:
+            take([by_sector[sector] for sector in matching_sectors], target_count, selected)
+            # If not enough sector-specific bonds, top up from remaining pool
+            take([fallback], target_count, selected)
 
-        # If not enough sector-specific bonds, add from remaining pool
-        if len(eligible_bonds) < target_count:
-            remaining = [b for b in available_bonds if b["isin"] not in assigned_isins]
-            eligible_bonds = remaining
-
-        # Take up to target_count bonds
-        selected = eligible_bonds[:min(target_count, len(eligible_bonds))]
-
-        # Add notional amounts and mark as assigned
-        for bond in selected:
-            bond_with_notional = bond.copy()
-            bond_with_notional["notional"] = portfolio["avg_notional"] * random.uniform(0.5, 1.5)
-            bond_with_notional["portfolio_id"] = portfolio["id"]
-            bond_with_notional["portfolio_name"] = portfolio["name"]
-            portfolio_assignments[portfolio["id"]].append(bond_with_notional)
-            assigned_isins.add(bond["isin"])
+        # Add notional amounts and portfolio tags
+        avg_notional = portfolio["avg_notional"]
+        multipliers = [0.5 + rng.random() for _ in selected]
+        for bond, multiplier in zip(selected, multipliers):
+            bond["notional"] = avg_notional * multiplier
+            bond["portfolio_id"] = portfolio["id"]
+            bond["portfolio_name"] = portfolio["name"]
+        portfolio_assignments[portfolio["id"]] = selected
 
     return portfolio_assignments
 
@@ -307,8 +347,10 @@ async def main():
     parser = argparse.ArgumentParser(description="Generate real bond database")
     parser.add_argument("--portfolios", type=int, default=10, help="Number of portfolios")
     parser.add_argument("--min-bonds", type=int, default=1000, help="Minimum total bonds")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible output")
     parser.add_argument("--output", type=str, default="data/bonds_database.json", help="Output file")
     args = parser.parse_args()
+    rng.seed(args.seed)
     
     print("=" * 80)
     print("GENERATING COMPREHENSIVE BOND DATABASE")
@@ -333,14 +375,17 @@ async def main():
     print(f"\nAssigning bonds to {len(PORTFOLIO_STRATEGIES)} portfolios...")
     portfolio_assignments = assign_bonds_to_portfolios(all_bonds, PORTFOLIO_STRATEGIES)
     
+    # Report each portfolio and accumulate the overall statistics in the same pass
+    total_bonds = 0
+    total_notional = 0.0
     for portfolio_id, bonds in portfolio_assignments.items():
-        portfolio = next(p for p in PORTFOLIO_STRATEGIES if p["id"] == portfolio_id)
-        total_notional = sum(b["notional"] for b in bonds)
-        print(f"  ✓ {portfolio['name']:30s} - {len(bonds):4d} bonds, ${total_notional/1e6:,.0f}M notional")
+        portfolio = PORTFOLIO_BY_ID[portfolio_id]
+        portfolio_notional = sum(b["notional"] for b in bonds)
+        total_bonds += len(bonds)
+        total_notional += portfolio_notional
+        print(f"  ✓ {portfolio['name']:30s} - {len(bonds):4d} bonds, ${portfolio_notional/1e6:,.0f}M notional")
     
-    # Calculate statistics
-    total_bonds = sum(len(bonds) for bonds in portfolio_assignments.values())
-    total_notional = sum(sum(b["notional"] for b in bonds) for bonds in portfolio_assignments.values())
+    # Average coupon covers every generated bond, assigned or not
     avg_coupon = sum(b["coupon_rate"] for b in all_bonds) / len(all_bonds)
     
     # Save to file
@@ -360,8 +405,11 @@ async def main():
         "bonds": portfolio_assignments,
     }
     
-    with open(output_path, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(output_data, f, indent=2)
     
     print(f"\n{'=' * 80}")
     print("SUMMARY")
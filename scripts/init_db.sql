@@ -19,9 +19,11 @@ CREATE TABLE instruments (
 );
 
 -- Indexes
-CREATE INDEX idx_instruments_type ON instruments(instrument_type);
-CREATE INDEX idx_instruments_created_at ON instruments(created_at);
-CREATE INDEX idx_instruments_portfolio ON instruments(portfolio_id);
+-- (created_at, id) matches the newest-first keyset order of the instrument list
+CREATE INDEX idx_instruments_type_created_at ON instruments(instrument_type, created_at DESC, id DESC);
+CREATE INDEX idx_instruments_created_at_id ON instruments(created_at DESC, id DESC);
+-- Covering index: portfolio lookups and aggregates read id/notional from the index alone
+CREATE INDEX idx_instruments_portfolio ON instruments(portfolio_id) INCLUDE (id, notional);
 
 -- ============================================
 -- BONDS TABLE (Child)
@@ -39,7 +41,7 @@ CREATE TABLE bonds (
     CONSTRAINT valid_dates CHECK (maturity_date > issue_date OR issue_date IS NULL)
 );
 
-CREATE INDEX idx_bonds_isin ON bonds(isin);
+-- ISIN lookups use the UNIQUE constraint's index
 CREATE INDEX idx_bonds_maturity ON bonds(maturity_date);
 
 -- ============================================
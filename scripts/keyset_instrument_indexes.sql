@@ -0,0 +1,24 @@
+-- ============================================
+-- Keyset Pagination Indexes
+-- Migration Script
+-- ============================================
+
+BEGIN;
+
+-- The instrument list pages by (created_at, id) newest-first
+CREATE INDEX IF NOT EXISTS idx_instruments_created_at_id ON instruments(created_at DESC, id DESC);
+
+-- Superseded by idx_instruments_created_at_id (same leading column)
+DROP INDEX IF EXISTS idx_instruments_created_at;
+
+-- Rebuild the type-filtered index with the id tie-breaker
+DROP INDEX IF EXISTS idx_instruments_type_created_at;
+CREATE INDEX idx_instruments_type_created_at ON instruments(instrument_type, created_at DESC, id DESC);
+
+COMMIT;
+
+-- Verification
+SELECT tablename, indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'instruments'
+ORDER BY indexname;
@@ -3,50 +3,118 @@
 Load bonds from generated JSON file into Security Master API.
 
 Usage:
-    python scripts/load_bonds_from_json.py --input data/bonds_database.json --batch-size 50
+    python scripts/load_bonds_from_json.py --input data/bonds_database.json --batch-size 500
 """
 
 import asyncio
 import argparse
 import json
+import random
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 import httpx
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+# Bulk requests allowed in flight at once
+MAX_CONCURRENT_BATCHES = 8
+# Retries for 429/5xx responses, with exponential backoff from the base delay
+MAX_RETRIES = 4
+RETRY_BASE_DELAY = 0.5
+# Connection-level retries done by the httpx transport
+CONNECT_RETRIES = 3
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _dumps(value) -> bytes:
+    """Serialize a request body to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def bond_payload(bond: Dict) -> Dict:
+    """Build the Security Master create payload for one bond."""
+    payload = {
+        "isin": bond["isin"],
+        "notional": bond["notional"],
+        "currency": "USD",
+        "coupon_rate": bond["coupon_rate"],
+        "maturity_date": bond["maturity_date"],
+        "issue_date": bond["issue_date"],
+        "payment_frequency": bond["payment_frequency"],
+        "day_count_convention": bond.get("day_count_convention", "30_360"),
+    }
+    # Add portfolio_id if present
+    if "portfolio_id" in bond:
+        payload["portfolio_id"] = bond["portfolio_id"]
+    return payload
+
+
+async def _post_with_retry(client: httpx.AsyncClient, url: str, body: bytes) -> Optional[httpx.Response]:
+    """POST a pre-encoded JSON body, retrying transient failures.
+
+    Rate-limit (429) and server (5xx) responses and transport errors are
+    retried with jittered exponential backoff, honouring Retry-After.
+    Returns the final response, or None if the request never got one.
+    """
+    response = None
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.post(url, content=body, headers=JSON_HEADERS)
+        except httpx.TransportError:
+            response = None
+
+        retryable = response is None or response.status_code == 429 or response.status_code >= 500
+        if not retryable or attempt == MAX_RETRIES:
+            break
+
+        # Jitter keeps concurrent batches from retrying in lockstep
+        delay = RETRY_BASE_DELAY * 2 ** attempt + random.random() * 0.1
+        if response is not None and response.headers.get("Retry-After", "").isdigit():
+            delay = max(delay, float(response.headers["Retry-After"]))
+        await asyncio.sleep(delay)
+
+    return response
+
+
+async def _load_bonds_individually(client: httpx.AsyncClient, bonds: List[Dict], api_url: str) -> tuple:
+    """Create bonds one request each, so an invalid row fails on its own."""
+    url = f"{api_url}/api/v1/instruments/bonds"
+    responses = await asyncio.gather(*(
+        _post_with_retry(client, url, _dumps(bond_payload(bond))) for bond in bonds
+    ))
+    success = sum(1 for r in responses if r is not None and r.status_code in (200, 201))
+    return success, len(bonds) - success
+
 
 async def load_bond_batch(client: httpx.AsyncClient, bonds: List[Dict], api_url: str) -> tuple:
-    """Load a batch of bonds concurrently."""
-    tasks = []
-    
-    for bond in bonds:
-        payload = {
-            "isin": bond["isin"],
-            "notional": bond["notional"],
-            "currency": "USD",
-            "coupon_rate": bond["coupon_rate"],
-            "maturity_date": bond["maturity_date"],
-            "issue_date": bond["issue_date"],
-            "payment_frequency": bond["payment_frequency"],
-            "day_count_convention": bond.get("day_count_convention", "30_360"),
-        }
-        # Add portfolio_id if present
-        if "portfolio_id" in bond:
-            payload["portfolio_id"] = bond["portfolio_id"]
-
-        task = client.post(
-            f"{api_url}/api/v1/instruments/bonds",
-            json=payload,
-            timeout=30.0,
-        )
-        tasks.append(task)
-    
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    success = sum(1 for r in results if not isinstance(r, Exception) and r.status_code in [200, 201])
-    failed = len(results) - success
-    
-    return success, failed
+    """Load a batch of bonds with a single bulk request.
+
+    Transient failures are retried (see _post_with_retry); failed
+    connection attempts are also retried by the client's transport. The
+    bulk endpoint validates the whole body, so if it rejects the batch with
+    422 the bonds are sent individually and only the invalid ones fail.
+    """
+    # Encode the body once; retries resend the same bytes
+    body = _dumps({"bonds": [bond_payload(bond) for bond in bonds]})
+    response = await _post_with_retry(client, f"{api_url}/api/v1/instruments/bonds/bulk", body)
+
+    if response is not None and response.status_code in (200, 201):
+        results = response.json()["results"]
+        success = sum(1 for r in results if r["status"] == "created")
+        return success, len(bonds) - success
+
+    if response is not None and response.status_code == 422:
+        return await _load_bonds_individually(client, bonds, api_url)
+
+    return 0, len(bonds)
 
 
 async def main():
@@ -54,7 +122,8 @@ async def main():
     parser = argparse.ArgumentParser(description="Load bonds from JSON")
     parser.add_argument("--input", type=str, default="data/bonds_database.json", help="Input JSON file")
     parser.add_argument("--api-url", type=str, default="http://localhost:8000", help="Security Master API URL")
-    parser.add_argument("--batch-size", type=int, default=50, help="Batch size for concurrent requests")
+    parser.add_argument("--batch-size", type=int, default=500, help="Bonds per bulk request")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_BATCHES, help="Bulk requests in flight at once")
     parser.add_argument("--portfolio", type=str, default=None, help="Load only specific portfolio ID")
     args = parser.parse_args()
     
@@ -69,59 +138,66 @@ async def main():
         print("   Run fetch_finra_bonds.py first to generate the bond database")
         return
     
-    with open(input_path, 'r') as f:
-        data = json.load(f)
+    raw = input_path.read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    
+    portfolios_by_id = {p['id']: p for p in data['portfolios']}
     
     print(f"\n📁 Loaded: {input_path}")
     print(f"📊 Generated: {data['generated_at']}")
     print(f"📈 Total bonds in file: {data['statistics']['total_bonds']:,}")
     
-    # Check API connectivity
-    print(f"\n🔗 Checking API at {args.api_url}...")
-    try:
-        async with httpx.AsyncClient() as client:
+    # One long-lived client shared by the health check and every batch
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    transport = httpx.AsyncHTTPTransport(limits=limits, retries=CONNECT_RETRIES)
+    async with httpx.AsyncClient(transport=transport, timeout=30.0) as client:
+        # Check API connectivity
+        print(f"\n🔗 Checking API at {args.api_url}...")
+        try:
             response = await client.get(f"{args.api_url}/health", timeout=5.0)
             if response.status_code != 200:
                 print(f"❌ API not responding")
                 return
-        print("✅ API is available")
-    except Exception as e:
-        print(f"❌ Cannot connect to API: {e}")
-        return
+            print("✅ API is available")
+        except Exception as e:
+            print(f"❌ Cannot connect to API: {e}")
+            return
     
-    # Collect bonds to load
-    bonds_to_load = []
-    if args.portfolio:
-        # Load specific portfolio
-        if args.portfolio in data['bonds']:
-            bonds_to_load = data['bonds'][args.portfolio]
-            portfolio_name = next(p['name'] for p in data['portfolios'] if p['id'] == args.portfolio)
-            print(f"\n📂 Loading portfolio: {portfolio_name} ({len(bonds_to_load)} bonds)")
+        # Collect bonds to load
+        if args.portfolio:
+            # Load specific portfolio
+            if args.portfolio in data['bonds']:
+                bonds_to_load = data['bonds'][args.portfolio]
+                portfolio_name = portfolios_by_id[args.portfolio]['name']
+                print(f"\n📂 Loading portfolio: {portfolio_name} ({len(bonds_to_load)} bonds)")
+            else:
+                print(f"❌ Portfolio '{args.portfolio}' not found")
+                return
         else:
-            print(f"❌ Portfolio '{args.portfolio}' not found")
-            return
-    else:
-        # Load all portfolios
-        for portfolio_id, bonds in data['bonds'].items():
-            bonds_to_load.extend(bonds)
-        print(f"\n📂 Loading all portfolios ({len(bonds_to_load)} bonds)")
+            # Load all portfolios
+            bonds_to_load = list(chain.from_iterable(data['bonds'].values()))
+            print(f"\n📂 Loading all portfolios ({len(bonds_to_load)} bonds)")
     
-    # Load in batches
-    print(f"\n⚙️  Loading in batches of {args.batch_size}...")
+        # Load in batches
+        print(f"\n⚙️  Loading in batches of {args.batch_size}...")
     
-    total_success = 0
-    total_failed = 0
+        total_success = 0
+        total_failed = 0
+        semaphore = asyncio.Semaphore(args.concurrency)
     
-    async with httpx.AsyncClient() as client:
-        # Process in batches
+        # Process in batches, several in flight at once so server commits overlap
         batches = [bonds_to_load[i:i+args.batch_size] for i in range(0, len(bonds_to_load), args.batch_size)]
-        
+    
         with tqdm(total=len(bonds_to_load), desc="Loading bonds", unit="bonds") as pbar:
-            for batch in batches:
-                success, failed = await load_bond_batch(client, batch, args.api_url)
+            async def bounded(batch: List[Dict]) -> None:
+                nonlocal total_success, total_failed
+                async with semaphore:
+                    success, failed = await load_bond_batch(client, batch, args.api_url)
                 total_success += success
                 total_failed += failed
                 pbar.update(len(batch))
+
+            await asyncio.gather(*(bounded(batch) for batch in batches))
     
     # Summary
     print(f"\n{'=' * 80}")
@@ -9,11 +9,20 @@ Data sources:
 """
 
 import asyncio
+import json
 import sys
+from collections import Counter
 from datetime import datetime
 from typing import List, Dict
 import httpx
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 # Real corporate and government bonds with accurate characteristics
 REAL_BONDS = [
     # === US TREASURY BONDS ===
@@ -337,35 +346,57 @@ REAL_BONDS = [
     },
 ]
 
+# Summary figures for the fixed bond list above
+TOTAL_NOTIONAL = sum(b["notional"] for b in REAL_BONDS)
+ISSUER_COUNTS = Counter(b["issuer"] for b in REAL_BONDS)
+
+
+def _dumps(value) -> bytes:
+    """Serialize a request body to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def bond_payload(bond: Dict) -> Dict:
+    """Build the Security Master create payload for one bond."""
+    return {
+        "isin": bond["isin"],
+        "notional": bond["notional"],
+        "currency": bond["currency"],
+        "coupon_rate": bond["coupon_rate"],
+        "maturity_date": bond["maturity_date"],
+        "issue_date": bond["issue_date"],
+        "payment_frequency": bond["payment_frequency"],
+        "day_count_convention": bond.get("day_count_convention", "30_360"),
+    }
 
-async def load_bond_to_api(client: httpx.AsyncClient, bond: Dict, api_url: str) -> bool:
-    """Load a single bond into the API."""
+
+async def load_bonds_to_api(client: httpx.AsyncClient, bonds: List[Dict], api_url: str) -> tuple:
+    """Load all bonds into the API with a single bulk request."""
     try:
         response = await client.post(
-            f"{api_url}/api/v1/instruments/bonds",
-            json={
-                "isin": bond["isin"],
-                "notional": bond["notional"],
-                "currency": bond["currency"],
-                "coupon_rate": bond["coupon_rate"],
-                "maturity_date": bond["maturity_date"],
-                "issue_date": bond["issue_date"],
-                "payment_frequency": bond["payment_frequency"],
-                "day_count_convention": bond.get("day_count_convention", "30_360"),
-            },
-            timeout=10.0,
+            f"{api_url}/api/v1/instruments/bonds/bulk",
+            content=_dumps({"bonds": [bond_payload(bond) for bond in bonds]}),
+            headers=JSON_HEADERS,
+            timeout=30.0,
         )
-        
-        if response.status_code == 200 or response.status_code == 201:
+    except Exception as e:
+        print(f"❌ Error loading bonds: {e}")
+        return 0, len(bonds)
+
+    if response.status_code not in (200, 201):
+        print(f"❌ Bulk load failed | Status: {response.status_code}")
+        return 0, len(bonds)
+
+    success_count = 0
+    for bond, result in zip(bonds, response.json()["results"]):
+        if result["status"] == "created":
             print(f"✅ Loaded: {bond['issuer']:20s} | {bond['description']}")
-            return True
+            success_count += 1
         else:
-            print(f"❌ Failed: {bond['issuer']:20s} | Status: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error loading {bond['issuer']}: {e}")
-        return False
+            print(f"❌ Failed: {bond['issuer']:20s} | {result.get('detail') or result['status']}")
+    return success_count, len(bonds) - success_count
 
 
 async def main():
@@ -379,35 +410,27 @@ async def main():
     print(f"Total bonds to load: {len(REAL_BONDS)}")
     print("\nChecking API connectivity...")
     
-    # Check if API is available
-    try:
-        async with httpx.AsyncClient() as client:
+    # One client for the health check and the load
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        # Check if API is available
+        try:
             response = await client.get(f"{api_url}/health", timeout=5.0)
             if response.status_code != 200:
                 print(f"❌ Security Master API not responding at {api_url}")
                 print("   Please ensure the system is running: docker-compose up -d")
                 sys.exit(1)
             print("✅ API is available\n")
-    except Exception as e:
-        print(f"❌ Cannot connect to API: {e}")
-        print("   Please ensure the system is running: docker-compose up -d")
-        sys.exit(1)
-    
-    # Load all bonds
-    print("-" * 80)
-    print("Loading bonds...")
-    print("-" * 80)
-    
-    success_count = 0
-    fail_count = 0
-    
-    async with httpx.AsyncClient() as client:
-        for bond in REAL_BONDS:
-            success = await load_bond_to_api(client, bond, api_url)
-            if success:
-                success_count += 1
-            else:
-                fail_count += 1
+        except Exception as e:
+            print(f"❌ Cannot connect to API: {e}")
+            print("   Please ensure the system is running: docker-compose up -d")
+            sys.exit(1)
+        
+        # Load all bonds
+        print("-" * 80)
+        print("Loading bonds...")
+        print("-" * 80)
+        
+        success_count, fail_count = await load_bonds_to_api(client, REAL_BONDS, api_url)
     
     # Summary
     print("\n" + "=" * 80)
@@ -415,15 +438,10 @@ async def main():
     print("=" * 80)
     print(f"✅ Successfully loaded: {success_count} bonds")
     print(f"❌ Failed: {fail_count} bonds")
-    print(f"📊 Total portfolio notional: ${sum(b['notional'] for b in REAL_BONDS):,.2f}")
+    print(f"📊 Total portfolio notional: ${TOTAL_NOTIONAL:,.2f}")
     print("\nBond breakdown by issuer:")
     
-    issuer_counts = {}
-    for bond in REAL_BONDS:
-        issuer = bond['issuer']
-        issuer_counts[issuer] = issuer_counts.get(issuer, 0) + 1
-    
-    for issuer, count in sorted(issuer_counts.items(), key=lambda x: -x[1]):
+    for issuer, count in ISSUER_COUNTS.most_common():
         print(f"  • {issuer:25s}: {count} bond(s)")
     
     print("\n✅ Done! Bonds are now available in the risk engine.")
@@ -0,0 +1,19 @@
+-- ============================================
+-- Portfolio Covering Index
+-- Migration Script
+-- ============================================
+
+BEGIN;
+
+-- Portfolio endpoints filter or group by portfolio_id and read only id and
+-- notional; carrying both in the index allows index-only scans
+DROP INDEX IF EXISTS idx_instruments_portfolio;
+CREATE INDEX idx_instruments_portfolio ON instruments(portfolio_id) INCLUDE (id, notional);
+
+COMMIT;
+
+-- Verification
+SELECT tablename, indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'instruments'
+ORDER BY indexname;
@@ -0,0 +1,23 @@
+-- ============================================
+-- Tune Instrument Indexes
+-- Migration Script
+-- ============================================
+
+BEGIN;
+
+-- Type-filtered list queries order by created_at; cover both in one index
+CREATE INDEX IF NOT EXISTS idx_instruments_type_created_at ON instruments(instrument_type, created_at);
+
+-- Superseded by idx_instruments_type_created_at (same leading column)
+DROP INDEX IF EXISTS idx_instruments_type;
+
+-- Duplicates the index behind bonds' UNIQUE (isin) constraint
+DROP INDEX IF EXISTS idx_bonds_isin;
+
+COMMIT;
+
+-- Verification
+SELECT tablename, indexname, indexdef
+FROM pg_indexes
+WHERE tablename IN ('instruments', 'bonds')
+ORDER BY tablename, indexname;
@@ -13,6 +13,7 @@ Usage:
 
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
 
 
@@ -107,8 +108,9 @@ def check_kafka() -> Tuple[bool, str]:
                     if "already exists" not in str(e):
                         return False, f"Failed to create topic: {e}"
 
-        # Refresh metadata
-        metadata = admin.list_topics(timeout=10)
+            # Refresh metadata so the new topic is listed
+            metadata = admin.list_topics(timeout=10)
+
         topics = list(metadata.topics.keys())
 
         return True, f"Connected. Broker: {metadata.brokers}. Topics: {topics}"
@@ -134,9 +136,15 @@ def main():
 
     results = []
 
-    for name, check_fn in checks:
-        print(f"Checking {name}...", end=" ", flush=True)
-        success, message = check_fn()
+    # Run the network-bound checks concurrently, then report in order
+    print(f"Checking {', '.join(name for name, _ in checks)}...")
+    print()
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [(name, executor.submit(check_fn)) for name, check_fn in checks]
+
+    for name, future in futures:
+        print(f"{name}:", end=" ")
+        success, message = future.result()
         status = "✓ OK" if success else "✗ FAILED"
         print(status)
         print(f"  {message}")
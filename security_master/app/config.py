@@ -1,5 +1,7 @@
 """Application configuration."""
 
+from typing import List
+
 from pydantic_settings import BaseSettings
 
 
@@ -12,10 +14,16 @@ class Settings(BaseSettings):
     postgres_host: str = "localhost"
     postgres_port: int = 5432
     postgres_db: str = "risk_db"
+    db_pool_size: int = 20  # Connections kept open (and warmed at startup)
+    db_max_overflow: int = 20  # Burst headroom; with pool_size, covers FastAPI's 40 worker threads
+    db_pool_recycle: int = 300  # Seconds before a pooled connection is replaced
 
     # Application
     app_name: str = "Security Master API"
     debug: bool = False
+    portfolio_cache_ttl: float = 30.0  # Seconds the portfolio list is reused between writes
+    # Browser origins allowed by CORS (JSON list in env, e.g. CORS_ORIGINS='["http://host:8501"]')
+    cors_origins: List[str] = ["http://localhost:8501"]
 
     @property
     def database_url(self) -> str:
@@ -1,5 +1,5 @@
 """Database module."""
 
-from .database import get_db, engine, SessionLocal
+from .database import get_db, engine, SessionLocal, warm_pool
 
-__all__ = ["get_db", "engine", "SessionLocal"]
+__all__ = ["get_db", "engine", "SessionLocal", "warm_pool"]
@@ -3,17 +3,28 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.db import warm_pool
 from app.routes import instruments_router, portfolios_router
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     print(f"Starting {settings.app_name}...")
+    try:
+        warm_pool()
+    except Exception as e:
+        print(f"Database pool warm-up skipped: {e}")
     yield
     # Shutdown
     print(f"Shutting down {settings.app_name}...")
@@ -24,15 +35,16 @@ app = FastAPI(
     description="RESTful API for instrument reference data (bonds and swaps)",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
 # Include routers
@@ -1,7 +1,7 @@
 """SQLAlchemy models for financial instruments."""
 
 import uuid
-from datetime import date, datetime
+from datetime import date
 from decimal import Decimal
 
 from sqlalchemy import (
@@ -14,6 +14,7 @@ from sqlalchemy import (
     CheckConstraint,
     TypeDecorator,
     CHAR,
+    func,
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
@@ -63,8 +64,8 @@ class Instrument(Base):
     notional = Column(Numeric(18, 2), nullable=False)
     currency = Column(String(3), nullable=False, default="USD")
     portfolio_id = Column(String(50), nullable=True)  # FK constraint exists in DB
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     bond = relationship("Bond", back_populates="instrument", uselist=False, cascade="all, delete-orphan")
@@ -1,17 +1,29 @@
 """API routes for instrument CRUD operations."""
 
-from typing import Optional
-from uuid import UUID
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID, uuid4
+import base64
+import binascii
+import json
 import math
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import Row, delete, func, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, raiseload
 
 from app.db import get_db
 from app.models import Instrument, Bond, InterestRateSwap
+from app.routes.portfolios import invalidate_portfolio_cache
 from app.schemas import (
     BondCreate,
     BondResponse,
+    BondBulkCreate,
+    BondBulkResult,
+    BondBulkResponse,
     SwapCreate,
     SwapResponse,
     InstrumentResponse,
@@ -25,8 +37,50 @@ router = APIRouter(prefix="/api/v1/instruments", tags=["instruments"])
 # Helper Functions
 # ============================================
 
-def instrument_to_response(instrument: Instrument) -> InstrumentResponse:
-    """Convert an Instrument model to a response schema."""
+def _bond_fields(instrument: Instrument) -> dict:
+    """Bond-specific response fields."""
+    bond = instrument.bond
+    if bond is None:
+        return {}
+    return {
+        "isin": bond.isin,
+        "coupon_rate": bond.coupon_rate,
+        "maturity_date": bond.maturity_date,
+        "issue_date": bond.issue_date,
+        "payment_frequency": bond.payment_frequency,
+        "day_count_convention": bond.day_count_convention,
+    }
+
+
+def _swap_fields(instrument: Instrument) -> dict:
+    """Swap-specific response fields."""
+    swap = instrument.swap
+    if swap is None:
+        return {}
+    return {
+        "fixed_rate": swap.fixed_rate,
+        "tenor": swap.tenor,
+        "trade_date": swap.trade_date,
+        "maturity_date": swap.maturity_date,
+        "effective_date": swap.effective_date,
+        "pay_receive": swap.pay_receive,
+        "float_index": swap.float_index,
+        "payment_frequency": swap.payment_frequency,
+    }
+
+
+# Only the relationship matching instrument_type is ever touched. Single-row
+# reads load it eagerly and raiseload("*") everything else, so a new lazy
+# attribute access fails loudly in tests instead of adding a query.
+_DETAIL_FIELDS = {"BOND": _bond_fields, "SWAP": _swap_fields}
+
+
+def _instrument_data(instrument: Instrument) -> dict:
+    """Flatten an Instrument and its bond/swap row into one dict of response fields.
+
+    The response schemas validate this dict directly, so building a response
+    is a single pydantic-core call rather than per-field keyword arguments.
+    """
     data = {
         "id": instrument.id,
         "instrument_type": instrument.instrument_type,
@@ -36,29 +90,136 @@ def instrument_to_response(instrument: Instrument) -> InstrumentResponse:
         "created_at": instrument.created_at,
         "updated_at": instrument.updated_at,
     }
+    data.update(_DETAIL_FIELDS[instrument.instrument_type](instrument))
+    return data
+
+
+def instrument_to_response(instrument: Instrument) -> InstrumentResponse:
+    """Convert an Instrument model to a response schema."""
+    return InstrumentResponse.model_validate(_instrument_data(instrument))
+
+
+def _encode_cursor(row: Row) -> str:
+    """Encode a list row's (created_at, id) sort key as an opaque cursor."""
+    key = [row.created_at.isoformat(), str(row.id)]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        created_at, instrument_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), UUID(instrument_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
-    if instrument.bond:
-        data.update({
-            "isin": instrument.bond.isin,
-            "coupon_rate": instrument.bond.coupon_rate,
-            "maturity_date": instrument.bond.maturity_date,
-            "issue_date": instrument.bond.issue_date,
-            "payment_frequency": instrument.bond.payment_frequency,
-            "day_count_convention": instrument.bond.day_count_convention,
+
+# Validates a whole page of list rows in one compiled call
+_INSTRUMENT_LIST_ADAPTER = TypeAdapter(List[InstrumentResponse])
+
+# Flat, read-only list rows straight from Core: each instrument has exactly
+# one child row, so outer-joining both tables yields one row per instrument
+# without ORM identity-map or relationship-loading work
+_LIST_QUERY = (
+    select(
+        Instrument.id,
+        Instrument.instrument_type,
+        Instrument.notional,
+        Instrument.currency,
+        Instrument.portfolio_id,
+        Instrument.created_at,
+        Instrument.updated_at,
+        Bond.isin,
+        Bond.coupon_rate,
+        Bond.issue_date,
+        Bond.day_count_convention,
+        func.coalesce(Bond.maturity_date, InterestRateSwap.maturity_date).label("maturity_date"),
+        func.coalesce(Bond.payment_frequency, InterestRateSwap.payment_frequency).label("payment_frequency"),
+        InterestRateSwap.fixed_rate,
+        InterestRateSwap.tenor,
+        InterestRateSwap.trade_date,
+        InterestRateSwap.effective_date,
+        InterestRateSwap.pay_receive,
+        InterestRateSwap.float_index,
+    )
+    .select_from(Instrument)
+    .outerjoin(Bond)
+    .outerjoin(InterestRateSwap)
+)
+
+
+# Dialect-specific INSERTs that support ON CONFLICT DO NOTHING
+_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _insert_bonds(db: Session, bonds: List[BondCreate]) -> List[Tuple[dict, dict]]:
+    """Insert bonds and their parent instruments without the ORM unit of work.
+
+    IDs are assigned here so each table takes a single executemany INSERT
+    (batched into multi-row statements by SQLAlchemy) and no flush or refresh
+    round-trip is needed; the database-side timestamps come back through
+    RETURNING. Bonds whose ISIN already exists are skipped with
+    ON CONFLICT (isin) DO NOTHING and their parent instruments removed again,
+    so a concurrent load of the same ISIN cannot fail the whole transaction.
+    Returns the inserted (instrument, bond) rows in input order; the caller
+    commits.
+    """
+    instrument_rows = []
+    bond_rows = []
+    for bond_data in bonds:
+        instrument_id = uuid4()
+        instrument_rows.append({
+            "id": instrument_id,
+            "instrument_type": "BOND",
+            "notional": bond_data.notional,
+            "currency": bond_data.currency,
+            "portfolio_id": bond_data.portfolio_id,
         })
-    elif instrument.swap:
-        data.update({
-            "fixed_rate": instrument.swap.fixed_rate,
-            "tenor": instrument.swap.tenor,
-            "trade_date": instrument.swap.trade_date,
-            "maturity_date": instrument.swap.maturity_date,
-            "effective_date": instrument.swap.effective_date,
-            "pay_receive": instrument.swap.pay_receive,
-            "float_index": instrument.swap.float_index,
-            "payment_frequency": instrument.swap.payment_frequency,
+        bond_rows.append({
+            "instrument_id": instrument_id,
+            "isin": bond_data.isin,
+            "coupon_rate": bond_data.coupon_rate,
+            "maturity_date": bond_data.maturity_date,
+            "issue_date": bond_data.issue_date,
+            "payment_frequency": bond_data.payment_frequency.value,
+            "day_count_convention": bond_data.day_count_convention.value,
         })
 
-    return InstrumentResponse(**data)
+    if not instrument_rows:
+        return []
+
+    timestamps = db.execute(
+        insert(Instrument).returning(
+            Instrument.created_at, Instrument.updated_at, sort_by_parameter_order=True,
+        ),
+        instrument_rows,
+    )
+    for row, (created_at, updated_at) in zip(instrument_rows, timestamps):
+        row["created_at"] = created_at
+        row["updated_at"] = updated_at
+
+    conflict_insert = _CONFLICT_INSERTS.get(db.get_bind().dialect.name)
+    if conflict_insert is None:
+        db.execute(insert(Bond), bond_rows)
+        return list(zip(instrument_rows, bond_rows))
+
+    inserted = set(db.scalars(
+        conflict_insert(Bond.__table__)
+        .on_conflict_do_nothing(index_elements=["isin"])
+        .returning(Bond.__table__.c.instrument_id),
+        bond_rows,
+    ))
+    orphaned = [row["id"] for row in instrument_rows if row["id"] not in inserted]
+    if orphaned:
+        db.execute(delete(Instrument.__table__).where(Instrument.__table__.c.id.in_(orphaned)))
+    return [
+        (instrument_row, bond_row)
+        for instrument_row, bond_row in zip(instrument_rows, bond_rows)
+        if instrument_row["id"] in inserted
+    ]
 
 
 # ============================================
@@ -68,51 +229,72 @@ def instrument_to_response(instrument: Instrument) -> InstrumentResponse:
 @router.post("/bonds", response_model=BondResponse, status_code=status.HTTP_201_CREATED)
 def create_bond(bond_data: BondCreate, db: Session = Depends(get_db)) -> BondResponse:
     """Create a new bond instrument."""
-    # Check for duplicate ISIN
-    existing = db.query(Bond).filter(Bond.isin == bond_data.isin).first()
-    if existing:
+    # The UNIQUE (isin) constraint is the duplicate check: a conflicting
+    # ISIN is skipped by the insert itself, so no SELECT is needed first
+    try:
+        rows = _insert_bonds(db, [bond_data])
+        db.commit()
+        invalidate_portfolio_cache()
+    except IntegrityError as e:
+        db.rollback()
+        if db.get_bind().dialect.name in _CONFLICT_INSERTS:
+            # Duplicate ISINs never raise here, so another constraint failed
+            # (e.g. the portfolio_id foreign key)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Bond violates a database constraint: {e.orig}",
+            )
+        rows = []  # Without ON CONFLICT support a duplicate ISIN raises
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Bond with ISIN {bond_data.isin} already exists",
         )
+    instrument_row, bond_row = rows[0]
 
-    # Create parent instrument
-    instrument = Instrument(
-        instrument_type="BOND",
-        notional=bond_data.notional,
-        currency=bond_data.currency,
-        portfolio_id=bond_data.portfolio_id,
-    )
-    db.add(instrument)
-    db.flush()  # Get the instrument ID
-
-    # Create bond details
-    bond = Bond(
-        instrument_id=instrument.id,
-        isin=bond_data.isin,
-        coupon_rate=bond_data.coupon_rate,
-        maturity_date=bond_data.maturity_date,
-        issue_date=bond_data.issue_date,
-        payment_frequency=bond_data.payment_frequency.value,
-        day_count_convention=bond_data.day_count_convention.value,
-    )
-    db.add(bond)
+    return BondResponse.model_validate({**instrument_row, **bond_row})
+
+
+@router.post("/bonds/bulk", response_model=BondBulkResponse, status_code=status.HTTP_201_CREATED)
+def create_bonds_bulk(payload: BondBulkCreate, db: Session = Depends(get_db)) -> BondBulkResponse:
+    """Create many bonds in a single transaction.
+
+    Rows whose ISIN already exists (in the database or earlier in the same
+    payload) are reported as duplicates instead of failing the whole batch.
+    """
+    isins = {b.isin for b in payload.bonds}
+    seen = {
+        isin for (isin,) in db.query(Bond.isin).filter(Bond.isin.in_(isins))
+    }
+
+    new_bonds = []
+    for bond_data in payload.bonds:
+        if bond_data.isin not in seen:
+            seen.add(bond_data.isin)
+            new_bonds.append(bond_data)
+
+    rows = _insert_bonds(db, new_bonds)
     db.commit()
-    db.refresh(instrument)
-
-    return BondResponse(
-        id=instrument.id,
-        isin=bond.isin,
-        notional=instrument.notional,
-        currency=instrument.currency,
-        coupon_rate=bond.coupon_rate,
-        maturity_date=bond.maturity_date,
-        issue_date=bond.issue_date,
-        payment_frequency=bond.payment_frequency,
-        day_count_convention=bond.day_count_convention,
-        portfolio_id=instrument.portfolio_id,
-        created_at=instrument.created_at,
-        updated_at=instrument.updated_at,
+    invalidate_portfolio_cache()
+
+    created = {bond_row["isin"]: instrument_row["id"] for instrument_row, bond_row in rows}
+    results = []
+    for bond_data in payload.bonds:
+        # pop() so a repeated ISIN is only reported as created once
+        instrument_id = created.pop(bond_data.isin, None)
+        if instrument_id is not None:
+            results.append(BondBulkResult(isin=bond_data.isin, status="created", id=instrument_id))
+        else:
+            results.append(BondBulkResult(
+                isin=bond_data.isin,
+                status="duplicate",
+                detail=f"Bond with ISIN {bond_data.isin} already exists",
+            ))
+
+    return BondBulkResponse(
+        results=results,
+        created=len(rows),
+        failed=len(results) - len(rows),
     )
 
 
@@ -121,6 +303,7 @@ def get_bond(bond_id: UUID, db: Session = Depends(get_db)) -> BondResponse:
     """Get a bond by ID."""
     instrument = (
         db.query(Instrument)
+        .options(joinedload(Instrument.bond), raiseload("*"))
         .filter(Instrument.id == bond_id, Instrument.instrument_type == "BOND")
         .first()
     )
@@ -130,19 +313,7 @@ def get_bond(bond_id: UUID, db: Session = Depends(get_db)) -> BondResponse:
             detail=f"Bond {bond_id} not found",
         )
 
-    return BondResponse(
-        id=instrument.id,
-        isin=instrument.bond.isin,
-        notional=instrument.notional,
-        currency=instrument.currency,
-        coupon_rate=instrument.bond.coupon_rate,
-        maturity_date=instrument.bond.maturity_date,
-        issue_date=instrument.bond.issue_date,
-        payment_frequency=instrument.bond.payment_frequency,
-        day_count_convention=instrument.bond.day_count_convention,
-        created_at=instrument.created_at,
-        updated_at=instrument.updated_at,
-    )
+    return BondResponse.model_validate(_instrument_data(instrument))
 
 
 # ============================================
@@ -152,46 +323,35 @@ def get_bond(bond_id: UUID, db: Session = Depends(get_db)) -> BondResponse:
 @router.post("/swaps", response_model=SwapResponse, status_code=status.HTTP_201_CREATED)
 def create_swap(swap_data: SwapCreate, db: Session = Depends(get_db)) -> SwapResponse:
     """Create a new interest rate swap."""
-    # Create parent instrument
-    instrument = Instrument(
-        instrument_type="SWAP",
-        notional=swap_data.notional,
-        currency=swap_data.currency,
-    )
-    db.add(instrument)
-    db.flush()
-
-    # Create swap details
-    swap = InterestRateSwap(
-        instrument_id=instrument.id,
-        fixed_rate=swap_data.fixed_rate,
-        tenor=swap_data.tenor,
-        trade_date=swap_data.trade_date,
-        maturity_date=swap_data.maturity_date,
-        effective_date=swap_data.effective_date,
-        pay_receive=swap_data.pay_receive.value,
-        float_index=swap_data.float_index.value,
-        payment_frequency=swap_data.payment_frequency.value,
-    )
-    db.add(swap)
+    # Assign the id up front and read the server timestamps back through
+    # RETURNING, so no flush or refresh round-trip is needed
+    instrument_row = {
+        "id": uuid4(),
+        "instrument_type": "SWAP",
+        "notional": swap_data.notional,
+        "currency": swap_data.currency,
+    }
+    instrument_row["created_at"], instrument_row["updated_at"] = db.execute(
+        insert(Instrument)
+        .values(instrument_row)
+        .returning(Instrument.created_at, Instrument.updated_at)
+    ).one()
+
+    swap_row = {
+        "instrument_id": instrument_row["id"],
+        "fixed_rate": swap_data.fixed_rate,
+        "tenor": swap_data.tenor,
+        "trade_date": swap_data.trade_date,
+        "maturity_date": swap_data.maturity_date,
+        "effective_date": swap_data.effective_date,
+        "pay_receive": swap_data.pay_receive.value,
+        "float_index": swap_data.float_index.value,
+        "payment_frequency": swap_data.payment_frequency.value,
+    }
+    db.execute(insert(InterestRateSwap).values(swap_row))
     db.commit()
-    db.refresh(instrument)
-
-    return SwapResponse(
-        id=instrument.id,
-        notional=instrument.notional,
-        currency=instrument.currency,
-        fixed_rate=swap.fixed_rate,
-        tenor=swap.tenor,
-        trade_date=swap.trade_date,
-        maturity_date=swap.maturity_date,
-        effective_date=swap.effective_date,
-        pay_receive=swap.pay_receive,
-        float_index=swap.float_index,
-        payment_frequency=swap.payment_frequency,
-        created_at=instrument.created_at,
-        updated_at=instrument.updated_at,
-    )
+
+    return SwapResponse.model_validate({**instrument_row, **swap_row})
 
 
 @router.get("/swaps/{swap_id}", response_model=SwapResponse)
@@ -199,6 +359,7 @@ def get_swap(swap_id: UUID, db: Session = Depends(get_db)) -> SwapResponse:
     """Get a swap by ID."""
     instrument = (
         db.query(Instrument)
+        .options(joinedload(Instrument.swap), raiseload("*"))
         .filter(Instrument.id == swap_id, Instrument.instrument_type == "SWAP")
         .first()
     )
@@ -208,21 +369,7 @@ def get_swap(swap_id: UUID, db: Session = Depends(get_db)) -> SwapResponse:
             detail=f"Swap {swap_id} not found",
         )
 
-    return SwapResponse(
-        id=instrument.id,
-        notional=instrument.notional,
-        currency=instrument.currency,
-        fixed_rate=instrument.swap.fixed_rate,
-        tenor=instrument.swap.tenor,
-        trade_date=instrument.swap.trade_date,
-        maturity_date=instrument.swap.maturity_date,
-        effective_date=instrument.swap.effective_date,
-        pay_receive=instrument.swap.pay_receive,
-        float_index=instrument.swap.float_index,
-        payment_frequency=instrument.swap.payment_frequency,
-        created_at=instrument.created_at,
-        updated_at=instrument.updated_at,
-    )
+    return SwapResponse.model_validate(_instrument_data(instrument))
 
 
 # ============================================
@@ -234,11 +381,23 @@ def list_instruments(
     page: int = Query(default=1, ge=1, description="Page number"),
     page_size: int = Query(default=50, ge=1, le=100, description="Items per page"),
     instrument_type: Optional[str] = Query(default=None, description="Filter by type (BOND/SWAP)"),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor from a previous page's next_cursor"),
+    include_total: bool = Query(default=True, description="Count matching rows for total/pages"),
     db: Session = Depends(get_db),
 ) -> InstrumentListResponse:
-    """List all instruments with pagination."""
-    query = db.query(Instrument)
-
+    """
+    List all instruments with pagination.
+
+    Pass ``cursor`` (the previous response's ``next_cursor``) to page by
+    keyset on (created_at, id); this stays fast at any depth. ``page`` is
+    kept for existing clients but is deprecated: deep offsets make the
+    database scan and discard every skipped row.
+
+    The COUNT behind ``total``/``pages`` often costs as much as the page
+    itself; clients that only walk forward can pass
+    ``include_total=false`` and rely on ``has_next``/``next_cursor``.
+    """
+    conditions = []
     if instrument_type:
         instrument_type = instrument_type.upper()
         if instrument_type not in ("BOND", "SWAP"):
@@ -246,32 +405,48 @@ def list_instruments(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="instrument_type must be BOND or SWAP",
             )
-        query = query.filter(Instrument.instrument_type == instrument_type)
+        conditions.append(Instrument.instrument_type == instrument_type)
 
-    total = query.count()
-    pages = math.ceil(total / page_size) if total > 0 else 1
+    total = pages = None
+    if include_total:
+        total = db.scalar(select(func.count()).select_from(Instrument).where(*conditions))
+        pages = math.ceil(total / page_size) if total > 0 else 1
 
-    instruments = (
-        query
-        .order_by(Instrument.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-        .all()
-    )
+    query = _LIST_QUERY.where(*conditions).order_by(Instrument.created_at.desc(), Instrument.id.desc())
+    if cursor is not None:
+        query = query.where(
+            tuple_(Instrument.created_at, Instrument.id) < _decode_cursor(cursor)
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+
+    # One extra row tells us whether another page follows
+    rows = db.execute(query.limit(page_size + 1)).all()
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_cursor(rows[-1])
 
     return InstrumentListResponse(
-        items=[instrument_to_response(i) for i in instruments],
+        items=_INSTRUMENT_LIST_ADAPTER.validate_python(rows, from_attributes=True),
         total=total,
         page=page,
         page_size=page_size,
         pages=pages,
+        has_next=next_cursor is not None,
+        next_cursor=next_cursor,
     )
 
 
 @router.get("/{instrument_id}", response_model=InstrumentResponse)
 def get_instrument(instrument_id: UUID, db: Session = Depends(get_db)) -> InstrumentResponse:
     """Get any instrument by ID."""
-    instrument = db.query(Instrument).filter(Instrument.id == instrument_id).first()
+    instrument = (
+        db.query(Instrument)
+        .options(joinedload(Instrument.bond), joinedload(Instrument.swap), raiseload("*"))
+        .filter(Instrument.id == instrument_id)
+        .first()
+    )
     if not instrument:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -292,3 +467,4 @@ def delete_instrument(instrument_id: UUID, db: Session = Depends(get_db)) -> Non
 
     db.delete(instrument)
     db.commit()
+    invalidate_portfolio_cache()
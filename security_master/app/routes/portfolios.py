@@ -1,14 +1,24 @@
 """API routes for portfolio operations."""
 
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from uuid import UUID
+import json
+import time
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from pydantic import BaseModel
 
+from app.config import settings
 from app.db import get_db
-from app.models import Instrument
+from app.models import Bond, Instrument
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
 
 
 router = APIRouter(prefix="/api/v1/portfolios", tags=["portfolios"])
@@ -30,7 +40,7 @@ class PortfolioResponse(BaseModel):
 class PortfolioDetailResponse(PortfolioResponse):
     """Detailed portfolio response with additional metrics."""
     avg_coupon: Optional[float] = None
-    instruments: List[int] = []
+    instruments: List[UUID] = []
 
 
 # Portfolio name mapping
@@ -48,13 +58,45 @@ PORTFOLIO_NAMES = {
 }
 
 
+@lru_cache(maxsize=256)
+def _name_info(portfolio_id: str) -> Tuple[str, str, str]:
+    """(name, description, strategy_type) for a portfolio, derived from its id if unknown."""
+    return PORTFOLIO_NAMES.get(portfolio_id) or (portfolio_id.replace("_", " ").title(), "", "UNKNOWN")
+
+
+def _dumps(value) -> bytes:
+    """Serialize a value to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+# Encoded list_portfolios body, reused until it expires or an instrument write
+# bumps the version (a result computed across a write is never stored)
+_portfolio_cache = {"version": 0, "expires": 0.0, "body": None}
+
+
+def invalidate_portfolio_cache() -> None:
+    """Drop the cached portfolio list after instruments change."""
+    _portfolio_cache["version"] += 1
+    _portfolio_cache["body"] = None
+
+
 @router.get("", response_model=List[PortfolioResponse])
-def list_portfolios(db: Session = Depends(get_db)) -> List[PortfolioResponse]:
+def list_portfolios(db: Session = Depends(get_db)) -> Response:
     """
     List all portfolios with summary statistics.
 
     Returns aggregated data for each portfolio_id found in instruments.
+    The rows are built from trusted aggregates, so they are encoded directly
+    instead of round-tripping through PortfolioResponse validation; the
+    encoded body is cached for ``portfolio_cache_ttl`` seconds.
     """
+    body = _portfolio_cache["body"]
+    if body is not None and time.monotonic() < _portfolio_cache["expires"]:
+        return Response(content=body, media_type="application/json")
+    version = _portfolio_cache["version"]
+
     # Query to get portfolio stats
     portfolio_stats = (
         db.query(
@@ -65,30 +107,29 @@ def list_portfolios(db: Session = Depends(get_db)) -> List[PortfolioResponse]:
         .filter(Instrument.portfolio_id.isnot(None))
         .filter(Instrument.portfolio_id != "")
         .group_by(Instrument.portfolio_id)
+        .order_by(func.count(Instrument.id).desc())
         .all()
     )
 
     portfolios = []
     for stat in portfolio_stats:
-        portfolio_id = stat.portfolio_id
-        name_info = PORTFOLIO_NAMES.get(
-            portfolio_id,
-            (portfolio_id.replace("_", " ").title(), "", "UNKNOWN")
+        name, description, strategy_type = _name_info(stat.portfolio_id)
+        portfolios.append({
+            "id": stat.portfolio_id,
+            "name": name,
+            "description": description,
+            "strategy_type": strategy_type,
+            "bond_count": stat.bond_count or 0,
+            "total_notional": float(stat.total_notional or 0),
+        })
+
+    body = _dumps(portfolios)
+    if version == _portfolio_cache["version"]:
+        _portfolio_cache.update(
+            body=body,
+            expires=time.monotonic() + settings.portfolio_cache_ttl,
         )
-
-        portfolios.append(PortfolioResponse(
-            id=portfolio_id,
-            name=name_info[0],
-            description=name_info[1],
-            strategy_type=name_info[2],
-            bond_count=stat.bond_count or 0,
-            total_notional=float(stat.total_notional or 0),
-        ))
-
-    # Sort by bond count descending
-    portfolios.sort(key=lambda p: p.bond_count, reverse=True)
-
-    return portfolios
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{portfolio_id}", response_model=PortfolioDetailResponse)
@@ -96,33 +137,31 @@ def get_portfolio(portfolio_id: str, db: Session = Depends(get_db)) -> Portfolio
     """
     Get detailed information for a specific portfolio.
     """
-    # Get instruments in this portfolio
-    instruments = (
-        db.query(Instrument)
+    # Only ids and notionals are needed, not full ORM objects
+    rows = (
+        db.query(Instrument.id, Instrument.notional)
         .filter(Instrument.portfolio_id == portfolio_id)
         .all()
     )
 
-    if not instruments:
+    if not rows:
         raise HTTPException(status_code=404, detail=f"Portfolio '{portfolio_id}' not found")
 
     # Calculate statistics
-    total_notional = sum(float(i.notional) for i in instruments)
-    bond_count = len(instruments)
-    instrument_ids = [i.id for i in instruments]
-
-    # Calculate average coupon (for bonds only)
-    coupons = []
-    for inst in instruments:
-        if inst.bond and inst.bond.coupon_rate:
-            coupons.append(float(inst.bond.coupon_rate))
-    avg_coupon = sum(coupons) / len(coupons) if coupons else None
-
-    # Get name info
-    name_info = PORTFOLIO_NAMES.get(
-        portfolio_id,
-        (portfolio_id.replace("_", " ").title(), "", "UNKNOWN")
+    total_notional = sum(float(notional) for _, notional in rows)
+    bond_count = len(rows)
+    instrument_ids = [instrument_id for instrument_id, _ in rows]
+
+    # Average coupon (bonds only) in one aggregate query
+    avg_coupon = (
+        db.query(func.avg(Bond.coupon_rate))
+        .join(Instrument)
+        .filter(Instrument.portfolio_id == portfolio_id)
+        .scalar()
     )
+    avg_coupon = float(avg_coupon) if avg_coupon is not None else None
+
+    name_info = _name_info(portfolio_id)
 
     return PortfolioDetailResponse(
         id=portfolio_id,
@@ -141,34 +180,23 @@ def get_portfolio_summary(portfolio_id: str, db: Session = Depends(get_db)):
     """
     Get summary statistics for a portfolio.
     """
-    from sqlalchemy import func as sqlfunc
-    from app.models import Bond
-
-    # Get basic stats
+    # Count, notional and average coupon in one row; the outer join keeps
+    # swaps in the count while AVG skips their NULL coupons
     stats = (
         db.query(
-            sqlfunc.count(Instrument.id).label("count"),
-            sqlfunc.sum(Instrument.notional).label("total_notional"),
+            func.count(Instrument.id).label("count"),
+            func.sum(Instrument.notional).label("total_notional"),
+            func.avg(Bond.coupon_rate).label("avg_coupon"),
         )
+        .outerjoin(Bond, Bond.instrument_id == Instrument.id)
         .filter(Instrument.portfolio_id == portfolio_id)
-        .first()
+        .one()
     )
 
-    if not stats or not stats.count:
+    if not stats.count:
         raise HTTPException(status_code=404, detail=f"Portfolio '{portfolio_id}' not found")
 
-    # Get average coupon
-    avg_coupon = (
-        db.query(sqlfunc.avg(Bond.coupon_rate))
-        .join(Instrument)
-        .filter(Instrument.portfolio_id == portfolio_id)
-        .scalar()
-    )
-
-    name_info = PORTFOLIO_NAMES.get(
-        portfolio_id,
-        (portfolio_id.replace("_", " ").title(), "", "UNKNOWN")
-    )
+    name_info = _name_info(portfolio_id)
 
     return {
         "portfolio_id": portfolio_id,
@@ -177,5 +205,5 @@ def get_portfolio_summary(portfolio_id: str, db: Session = Depends(get_db)):
         "strategy_type": name_info[2],
         "bond_count": stats.count,
         "total_notional": float(stats.total_notional or 0),
-        "avg_coupon": float(avg_coupon) if avg_coupon else None,
+        "avg_coupon": float(stats.avg_coupon) if stats.avg_coupon else None,
     }
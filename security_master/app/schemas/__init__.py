@@ -3,6 +3,9 @@
 from .instrument import (
     BondCreate,
     BondResponse,
+    BondBulkCreate,
+    BondBulkResult,
+    BondBulkResponse,
     SwapCreate,
     SwapResponse,
     InstrumentResponse,
@@ -15,6 +18,9 @@ from .instrument import (
 __all__ = [
     "BondCreate",
     "BondResponse",
+    "BondBulkCreate",
+    "BondBulkResult",
+    "BondBulkResponse",
     "SwapCreate",
     "SwapResponse",
     "InstrumentResponse",
@@ -3,10 +3,10 @@
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Optional, List
+from typing import Annotated, Optional, List
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
+from pydantic import BaseModel, Field, StringConstraints, model_validator, ConfigDict
 
 
 class PayReceive(str, Enum):
@@ -45,7 +45,9 @@ class FloatIndex(str, Enum):
 class BondCreate(BaseModel):
     """Schema for creating a bond."""
 
-    isin: str = Field(..., min_length=12, max_length=12, description="12-character ISIN")
+    isin: Annotated[
+        str, StringConstraints(min_length=12, max_length=12, pattern=r"^[A-Za-z0-9]{12}$", to_upper=True)
+    ] = Field(..., description="12-character alphanumeric ISIN (upper-cased)")
     notional: Decimal = Field(..., gt=0, description="Face value of the bond")
     currency: str = Field(default="USD", min_length=3, max_length=3)
     coupon_rate: Decimal = Field(..., ge=0, le=1, description="Coupon rate as decimal (e.g., 0.0375)")
@@ -55,14 +57,6 @@ class BondCreate(BaseModel):
     day_count_convention: DayCountConvention = Field(default=DayCountConvention.ACT_ACT)
     portfolio_id: Optional[str] = Field(default=None, description="Portfolio ID for grouping")
 
-    @field_validator("isin")
-    @classmethod
-    def validate_isin(cls, v: str) -> str:
-        """Validate ISIN format."""
-        if not v.isalnum():
-            raise ValueError("ISIN must be alphanumeric")
-        return v.upper()
-
     @model_validator(mode="after")
     def validate_dates(self):
         """Validate date relationships."""
@@ -77,9 +71,9 @@ class BondResponse(BaseModel):
     id: UUID
     instrument_type: str = "BOND"
     isin: str
-    notional: Decimal
+    notional: float
     currency: str
-    coupon_rate: Decimal
+    coupon_rate: float
     maturity_date: date
     issue_date: Optional[date]
     payment_frequency: str
@@ -91,6 +85,29 @@ class BondResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BondBulkCreate(BaseModel):
+    """Schema for creating many bonds in one request."""
+
+    bonds: List[BondCreate] = Field(..., min_length=1, max_length=5000)
+
+
+class BondBulkResult(BaseModel):
+    """Per-row outcome of a bulk bond create."""
+
+    isin: str
+    status: str  # "created" or "duplicate"
+    id: Optional[UUID] = None
+    detail: Optional[str] = None
+
+
+class BondBulkResponse(BaseModel):
+    """Schema for bulk bond create response."""
+
+    results: List[BondBulkResult]
+    created: int
+    failed: int
+
+
 # ============================================
 # Swap Schemas
 # ============================================
@@ -124,9 +141,9 @@ class SwapResponse(BaseModel):
 
     id: UUID
     instrument_type: str = "SWAP"
-    notional: Decimal
+    notional: float
     currency: str
-    fixed_rate: Decimal
+    fixed_rate: float
     tenor: str
     trade_date: date
     maturity_date: date
@@ -149,7 +166,7 @@ class InstrumentResponse(BaseModel):
 
     id: UUID
     instrument_type: str
-    notional: Decimal
+    notional: float
     currency: str
     portfolio_id: Optional[str] = None
     created_at: datetime
@@ -157,14 +174,14 @@ class InstrumentResponse(BaseModel):
 
     # Bond-specific (optional)
     isin: Optional[str] = None
-    coupon_rate: Optional[Decimal] = None
+    coupon_rate: Optional[float] = None
     maturity_date: Optional[date] = None
     issue_date: Optional[date] = None
     payment_frequency: Optional[str] = None
     day_count_convention: Optional[str] = None
 
     # Swap-specific (optional)
-    fixed_rate: Optional[Decimal] = None
+    fixed_rate: Optional[float] = None
     tenor: Optional[str] = None
     trade_date: Optional[date] = None
     effective_date: Optional[date] = None
@@ -178,7 +195,9 @@ class InstrumentListResponse(BaseModel):
     """Paginated list of instruments."""
 
     items: List[InstrumentResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int] = None
+    has_next: bool = False
+    next_cursor: Optional[str] = None
@@ -1,8 +1,11 @@
 """Tests for instrument API endpoints."""
 
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -92,6 +95,25 @@ class TestBondEndpoints:
         response = client.post("/api/v1/instruments/bonds", json=bond_data)
         assert response.status_code == 409
 
+    def test_create_bond_unknown_portfolio(self, client):
+        """Test that a non-ISIN constraint violation is not reported as a duplicate."""
+        # The portfolio_id foreign key only exists in PostgreSQL, so raise
+        # the error it would produce
+        error = IntegrityError(
+            "INSERT INTO instruments ...", {},
+            Exception('violates foreign key constraint "instruments_portfolio_id_fkey"'),
+        )
+        with patch("app.routes.instruments._insert_bonds", side_effect=error):
+            response = client.post("/api/v1/instruments/bonds", json={
+                "isin": "US912810TZ98",
+                "notional": 1000000.00,
+                "coupon_rate": 0.0375,
+                "maturity_date": "2030-01-15",
+                "portfolio_id": "NO_SUCH_PORTFOLIO",
+            })
+        assert response.status_code == 400
+        assert "instruments_portfolio_id_fkey" in response.json()["detail"]
+
     def test_create_bond_invalid_coupon(self, client):
         """Test creating a bond with invalid coupon rate fails."""
         bond_data = {
@@ -103,6 +125,35 @@ class TestBondEndpoints:
         response = client.post("/api/v1/instruments/bonds", json=bond_data)
         assert response.status_code == 422
 
+    def test_create_bonds_bulk(self, client):
+        """Test bulk creation reports duplicates per row."""
+        client.post("/api/v1/instruments/bonds", json={
+            "isin": "US912810TC00",
+            "notional": 1000000.00,
+            "coupon_rate": 0.0375,
+            "maturity_date": "2030-01-15",
+        })
+        bonds = [
+            {"isin": isin, "notional": 500000.00, "coupon_rate": 0.04, "maturity_date": "2032-06-30"}
+            for isin in ("US912810TD00", "US912810TC00", "US912810TE00", "US912810TD00")
+        ]
+        response = client.post("/api/v1/instruments/bonds/bulk", json={"bonds": bonds})
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created"] == 2
+        assert data["failed"] == 2
+        assert [r["status"] for r in data["results"]] == [
+            "created", "duplicate", "created", "duplicate",
+        ]
+        bond_id = data["results"][0]["id"]
+
+        response = client.get(f"/api/v1/instruments/bonds/{bond_id}")
+        assert response.status_code == 200
+        assert response.json()["isin"] == "US912810TD00"
+
+        response = client.get("/api/v1/instruments?instrument_type=BOND")
+        assert response.json()["total"] == 3
+
     def test_get_bond(self, client):
         """Test getting a bond by ID."""
         # Create bond first
@@ -240,6 +291,52 @@ class TestInstrumentListEndpoints:
         assert data["total"] == 1
         assert data["items"][0]["instrument_type"] == "BOND"
 
+    def test_list_instruments_without_total(self, client):
+        """Test that include_total=false skips the count but reports has_next."""
+        for isin in ("US912810TF00", "US912810TG00"):
+            client.post("/api/v1/instruments/bonds", json={
+                "isin": isin,
+                "notional": 1000000.00,
+                "coupon_rate": 0.0375,
+                "maturity_date": "2030-01-15",
+            })
+
+        response = client.get("/api/v1/instruments?include_total=false&page_size=1")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        assert data["pages"] is None
+        assert data["has_next"] is True
+        assert len(data["items"]) == 1
+
+        response = client.get("/api/v1/instruments?include_total=false&page=2&page_size=1")
+        assert response.json()["has_next"] is False
+
+    def test_get_instrument(self, client):
+        """Test fetching bonds and swaps through the generic endpoint."""
+        bond_id = client.post("/api/v1/instruments/bonds", json={
+            "isin": "US912810TH00",
+            "notional": 1000000.00,
+            "coupon_rate": 0.0375,
+            "maturity_date": "2030-01-15",
+        }).json()["id"]
+        swap_id = client.post("/api/v1/instruments/swaps", json={
+            "notional": 10000000.00,
+            "fixed_rate": 0.0410,
+            "tenor": "5Y",
+            "trade_date": "2024-01-15",
+            "maturity_date": "2029-01-15",
+            "pay_receive": "PAY",
+        }).json()["id"]
+
+        response = client.get(f"/api/v1/instruments/{bond_id}")
+        assert response.status_code == 200
+        assert response.json()["isin"] == "US912810TH00"
+
+        response = client.get(f"/api/v1/instruments/{swap_id}")
+        assert response.status_code == 200
+        assert response.json()["tenor"] == "5Y"
+
     def test_delete_instrument(self, client):
         """Test deleting an instrument."""
         # Create a bond